@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+from typing import Callable, Hashable, List, Sequence
+
+from custom_numbers.computation import DecimalNumber
+
+
+class FunctionCache(ABC):
+    """Remembers function values and counts how often they are reused"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pinned = {}
+
+    def function_key(self, func: Callable) -> Hashable:
+        """Keys unhashable functions by the identity of their owner"""
+        # The owner is kept alive so that its identity cannot be reused while
+        # values are stored against it
+        try:
+            hash(func)
+            return func
+        except TypeError:
+            owner = getattr(func, '__self__', func)
+            self.pinned[id(owner)] = owner
+            return id(owner), getattr(func, '__name__', None)
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @abstractmethod
+    def lookup(self, key: Hashable):
+        """Returns the stored value or raises KeyError"""
+
+    @abstractmethod
+    def store(self, key: Hashable, value):
+        """Stores a value, evicting older ones if the policy requires it"""
+
+    @abstractmethod
+    def clear(self):
+        """Discards every stored value but keeps the statistics"""
+
+    def get(self, func_key: Hashable, func: Callable, x):
+        """Returns func(x), evaluating it only if it is not stored already"""
+        prec = getcontext().prec
+        key = (func_key, x)
+        try:
+            value = self.__lookup_at(key, prec)
+        except KeyError:
+            self.misses += 1
+            value = func(x)
+            self.store(key, (_precision_of(value, prec), value))
+            return value
+        self.hits += 1
+        return value
+
+    def get_many(
+        self, func_key: Hashable, batch: Callable[[list], Sequence],
+        xs: Sequence,
+    ) -> List:
+        """
+        Returns the value at every x in xs, evaluating the missing ones in a
+        single call of batch
+        """
+        prec = getcontext().prec
+        values = {}
+        missing = []
+        for x in xs:
+            if x in values:
+                continue
+            try:
+                values[x] = self.__lookup_at((func_key, x), prec)
+                self.hits += 1
+            except KeyError:
+                values[x] = None
+                missing.append(x)
+        if missing:
+            self.misses += len(missing)
+            for x, value in zip(missing, batch(missing)):
+                values[x] = value
+                self.store(
+                    (func_key, x), (_precision_of(value, prec), value)
+                )
+        return [values[x] for x in xs]
+
+    def __lookup_at(self, key: Hashable, prec: int):
+        # A decimal value is only reused at precisions up to the one it was
+        # computed in
+        computed_prec, value = self.lookup(key)
+        if computed_prec is not None and computed_prec < prec:
+            raise KeyError(key)
+        return value
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f'{type(self).__name__}(size={len(self)},hits={self.hits},' \
+               f'misses={self.misses},evictions={self.evictions})'
+
+
+def _precision_of(value, prec: int):
+    # Floats and exact numbers do not depend on the decimal context
+    if isinstance(value, (Decimal, DecimalNumber)):
+        return prec
+    return None
+
+
+class UnboundedCache(FunctionCache):
+    def __init__(self):
+        FunctionCache.__init__(self)
+        self.values = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def lookup(self, key: Hashable):
+        return self.values[key]
+
+    def store(self, key: Hashable, value):
+        self.values[key] = value
+
+    def clear(self):
+        self.values = {}
+        self.pinned = {}
+
+
+class LRUCache(FunctionCache):
+    """Holds at most max_size values, evicting the least recently used"""
+
+    def __init__(self, max_size: int = 100000):
+        if max_size < 1:
+            raise Exception('An LRU cache must be able to hold at least one '
+                            'value.')
+        FunctionCache.__init__(self)
+        self.max_size = max_size
+        self.values = OrderedDict()
+
+    def __len__(self):
+        return len(self.values)
+
+    def lookup(self, key: Hashable):
+        value = self.values[key]
+        self.values.move_to_end(key)
+        return value
+
+    def store(self, key: Hashable, value):
+        self.values[key] = value
+        if len(self.values) > self.max_size:
+            self.values.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.values = OrderedDict()
+        self.pinned = {}
@@ -1,10 +1,45 @@
+from functools import lru_cache
+
+from custom_numbers.dual import DualNumber
+from custom_numbers.jet import Jet
 from elementary_functions.calculus_utils import ConstantFunction, \
     DifferentiableFunction
 from elementary_functions.simple import CharacteristicFunction, SimpleFunction
-from elementary_functions.utils import Function, FunctionSum
+from elementary_functions.utils import CompositeFunction, Function, \
+    FunctionProd, FunctionSum
 
 
 def differentiate(func: Function):
+    """Returns the derivative of func, memoized for hashable functions"""
+    try:
+        key = _typed_key(func)
+        hash((func, key))
+    except TypeError:
+        return _differentiate(func)
+    return _memoized_differentiate(func, key)
+
+
+@lru_cache(maxsize=1024)
+def _memoized_differentiate(func: Function, key):
+    return _differentiate(func)
+
+
+def _typed_key(value):
+    # Functions are equal when their numbers are, but 0.5 == Decimal('0.5')
+    # and their derivatives keep the type of each number. The key spells out
+    # the public attributes of every node along with the number types.
+    if hasattr(value, '__dict__') and not callable(value):
+        return type(value), tuple(
+            (name, _typed_key(attribute))
+            for name, attribute in vars(value).items()
+            if not name.startswith('_')
+        )
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(map(_typed_key, value))
+    return type(value), value
+
+
+def _differentiate(func: Function):
     if isinstance(func, DifferentiableFunction):
         return func.differentiate()
     if isinstance(func, FunctionSum):
@@ -12,7 +47,89 @@ def differentiate(func: Function):
             map(lambda x: differentiate(x), func.constituents),
             ConstantFunction(),
         )
+    if isinstance(func, FunctionProd):
+        return FunctionSum(*(
+            FunctionProd(*(
+                func.constituents[:n]
+                + [differentiate(func.constituents[n])]
+                + func.constituents[n + 1:]
+            ))
+            for n in range(len(func.constituents))
+        ))
+    if isinstance(func, CompositeFunction):
+        return FunctionProd(
+            differentiate(func.inner),
+            CompositeFunction(differentiate(func.outer), func.inner),
+        )
     if isinstance(func, CharacteristicFunction) \
             or isinstance(func, SimpleFunction):
         return ConstantFunction()
     raise NotImplementedError
+
+
+def derivative_at(func, x):
+    """Returns the derivative of func at x from one dual number evaluation"""
+    func = getattr(func, 'evaluate', func)
+    result = func(DualNumber(x, x - x + 1))
+    if isinstance(result, DualNumber):
+        return result.derivative
+    # func does not depend on its argument
+    return x - x
+
+
+def derivatives_at(func, x, k):
+    """Returns [f(x), f'(x), ..., f^(k)(x)] from one Taylor evaluation"""
+    func = getattr(func, 'evaluate', func)
+    result = func(Jet.variable(x, k))
+    if isinstance(result, Jet):
+        return [
+            result.derivative(n) if n > 0 else result.value
+            for n in range(k + 1)
+        ]
+    return [result] + [x - x] * k
+
+
+def critical_points(derivative, a, b, resolution=100):
+    """Returns the points of (a, b) at which derivative changes sign"""
+    # A pair of sign changes between two samples goes unnoticed. Samples at
+    # which the derivative cannot be evaluated are returned as they are, so
+    # that callers treat them as possible extrema.
+    evaluate = getattr(derivative, 'evaluate', derivative)
+
+    def sign(x):
+        try:
+            value = evaluate(x)
+        except (ArithmeticError, ValueError):
+            return None
+        return (value > 0) - (value < 0)
+
+    step = (b - a) / resolution
+    points = []
+    lower = a
+    lower_sign = sign(a)
+    for n in range(1, resolution + 1):
+        upper = b if n == resolution else a + n * step
+        upper_sign = sign(upper)
+        if upper_sign is None or upper_sign == 0:
+            if n < resolution:
+                points.append(upper)
+        elif lower_sign is not None and lower_sign * upper_sign < 0:
+            points.append(_bisect_sign_change(sign, lower, upper, lower_sign))
+        lower = upper
+        lower_sign = upper_sign
+    return points
+
+
+def _bisect_sign_change(sign, lower, upper, lower_sign, iterations=100):
+    for _ in range(iterations):
+        middle = (lower + upper) / 2
+        if middle <= lower or middle >= upper:
+            break
+        middle_sign = sign(middle)
+        if middle_sign is None or middle_sign == 0:
+            return middle
+        if middle_sign == lower_sign:
+            lower = middle
+        else:
+            upper = middle
+    return (lower + upper) / 2
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from math import inf, nextafter
+from typing import Tuple
+
+from calculus.differentiator import differentiate
+from custom_numbers.computation import DecimalNumber
+from custom_numbers.types import ComputationType
+from elementary_functions.calculus_utils import ConstantFunction
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.power import PowerFunction
+from elementary_functions.simple import CharacteristicFunction, \
+    SimpleFunction
+from elementary_functions.utils import CompositeFunction, Function, \
+    FunctionProd, FunctionSum
+
+Enclosure = Tuple[ComputationType, ComputationType]
+
+
+def enclose(func: Function, lower, upper) -> Enclosure:
+    """Returns (low, high) with low <= func(x) <= high on [lower, upper]"""
+    # Interval arithmetic cannot tell that two occurrences of x are the same
+    # number, so anything but a monotone polynomial may be overestimated.
+    # Unbounded functions raise ArithmeticError.
+    if upper < lower:
+        raise NotImplementedError
+    if isinstance(func, PowerFunction):
+        if func.power == 0:
+            value = lower - lower + func.coefficient
+            return value, value
+        return _scale(func.coefficient, _power(func.power, lower, upper))
+    if isinstance(func, ConstantFunction):
+        return func.val, func.val
+    if isinstance(func, Polynomial):
+        return _enclose_polynomial(func, lower, upper)
+    if isinstance(func, FunctionSum) or isinstance(func, SimpleFunction):
+        result = (lower - lower, lower - lower)
+        for constituent in func.constituents:
+            result = _add(result, enclose(constituent, lower, upper))
+        return result
+    if isinstance(func, FunctionProd):
+        if len(func.constituents) == 0:
+            raise ArithmeticError
+        result = enclose(func.constituents[0], lower, upper)
+        for constituent in func.constituents[1:]:
+            result = _multiply(result, enclose(constituent, lower, upper))
+        return result
+    if isinstance(func, CompositeFunction):
+        return enclose(func.outer, *enclose(func.inner, lower, upper))
+    if isinstance(func, CharacteristicFunction):
+        return _enclose_characteristic(func, lower, upper)
+    raise NotImplementedError
+
+
+# Every rounded operation is widened by one unit in the last place so that
+# the enclosure survives rounding. Exact numbers need no widening.
+def _down(x):
+    if isinstance(x, DecimalNumber) and x.inf_type == 0:
+        return DecimalNumber(x.d.next_minus())
+    if isinstance(x, Decimal) and x.is_finite():
+        return x.next_minus()
+    if isinstance(x, float):
+        return nextafter(x, -inf)
+    return x
+
+
+def _up(x):
+    if isinstance(x, DecimalNumber) and x.inf_type == 0:
+        return DecimalNumber(x.d.next_plus())
+    if isinstance(x, Decimal) and x.is_finite():
+        return x.next_plus()
+    if isinstance(x, float):
+        return nextafter(x, inf)
+    return x
+
+
+def _outward(low, high) -> Enclosure:
+    return _down(low), _up(high)
+
+
+def _add(first: Enclosure, second: Enclosure) -> Enclosure:
+    return _outward(first[0] + second[0], first[1] + second[1])
+
+
+def _multiply(first: Enclosure, second: Enclosure) -> Enclosure:
+    products = [x * y for x in first for y in second]
+    return _outward(min(products), max(products))
+
+
+def _scale(c, enclosure: Enclosure) -> Enclosure:
+    if c == 1:
+        return enclosure
+    if c < 0:
+        return _outward(enclosure[1] * c, enclosure[0] * c)
+    return _outward(enclosure[0] * c, enclosure[1] * c)
+
+
+def _power(p, lower, upper) -> Enclosure:
+    if p == 1:
+        return lower, upper
+    if p == int(p):
+        p = int(p)
+        if p < 0 and lower <= 0 <= upper:
+            raise ArithmeticError(f'x^{p} is not bounded on '
+                                  f'[{lower}, {upper}].')
+        even = p % 2 == 0
+        if even and lower < 0 < upper:
+            return _outward(lower - lower, max(lower ** p, upper ** p))
+        # Otherwise x^p is monotone on [lower, upper]
+        increasing = (p > 0) == (lower >= 0) if even else p > 0
+    else:
+        # Only the part of [lower, upper] on which x^p is defined counts.
+        # This also absorbs the widening of an inner enclosure that touches
+        # zero from above.
+        if upper < 0 or p < 0 and upper <= 0:
+            raise ArithmeticError(f'x^({p}) is not defined on '
+                                  f'[{lower}, {upper}].')
+        if lower < 0:
+            lower = lower - lower
+        if p < 0 and lower == 0:
+            raise ArithmeticError(f'x^({p}) is not bounded on '
+                                  f'[{lower}, {upper}].')
+        increasing = p > 0
+    if increasing:
+        return _outward(lower ** p, upper ** p)
+    return _outward(upper ** p, lower ** p)
+
+
+def _enclose_polynomial(func: Polynomial, lower, upper) -> Enclosure:
+    if len(func.constituents) > 1:
+        slope = enclose(func.differentiate(), lower, upper)
+        if slope[0] >= 0 or slope[1] <= 0:
+            # Enclosing each endpoint on its own keeps the rounding of the
+            # evaluation inside the bounds.
+            at_lower = _enclose_terms(func, lower, lower)
+            at_upper = _enclose_terms(func, upper, upper)
+            return min(at_lower[0], at_upper[0]), \
+                max(at_lower[1], at_upper[1])
+    return _enclose_terms(func, lower, upper)
+
+
+def _enclose_terms(func: Polynomial, lower, upper) -> Enclosure:
+    result = (lower - lower, lower - lower)
+    for constituent in func.constituents:
+        result = _add(result, enclose(constituent, lower, upper))
+    return result
+
+
+def _enclose_characteristic(
+    func: CharacteristicFunction, lower, upper
+) -> Enclosure:
+    zero = lower - lower
+    if func.domain.contains(lower) and func.domain.contains(upper):
+        return zero + func.coefficient, zero + func.coefficient
+    if upper < func.domain.a or func.domain.b < lower:
+        return zero, zero
+    return zero + min(0, func.coefficient), zero + max(0, func.coefficient)
+
+
+def second_derivative(func: Function):
+    """
+    Returns the second derivative of func, or None when the tree cannot be
+    differentiated twice.
+    """
+    try:
+        return differentiate(differentiate(func))
+    except NotImplementedError:
+        return None
@@ -1,6 +1,20 @@
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from decimal import Decimal, getcontext, localcontext
 from enum import Enum
+from heapq import heappop, heappush
 from typing import Callable
 
+from algebra.linear.utils import Profiler, TimingContext
+from calculus import vectorized
+from calculus.differentiator import critical_points, derivative_at, \
+    differentiate
+from calculus.enclosure import enclose, second_derivative
+from calculus.cache import FunctionCache, UnboundedCache
+from calculus.quadrature import gauss_kronrod, tanh_sinh
+from custom_numbers.computation import DecimalArray, DecimalNumber, \
+    working_context, working_digits
 from custom_numbers.exact.factory import to_exact
 from custom_numbers.types import ComputationType
 from custom_numbers.utils import minimum, maximum
@@ -8,20 +22,84 @@ from elementary_functions.polynomial import Polynomial
 from elementary_functions.power import PowerFunction
 from elementary_functions.simple import CharacteristicFunction, Interval, \
     SimpleFunction
-from elementary_functions.utils import FunctionSum
+from elementary_functions.utils import FunctionSum, function_of
 
 
 class Mode(Enum):
     FLUCTUATING = 0
     INCREASING = 1
     DECREASING = 2
+    # Samples all of [a, b] once on a grid shared by every panel and bounds
+    # each panel by the samples that fall on it.
+    SHARED_GRID = 3
+    # Finds the critical points of func once and bounds each panel by its
+    # endpoints and the critical points inside it, because func is monotone
+    # in between. A Function tree is differentiated symbolically, any other
+    # callable with dual numbers.
+    MONOTONE_PIECES = 4
+    # Bounds each panel, and each interval's error, by evaluating a Function
+    # tree in interval arithmetic. The bounds are guaranteed rather than
+    # sampled, and adaptive refinement bisects.
+    ENCLOSURE = 5
+
+
+class Backend(Enum):
+    SCALAR = 0
+    NUMPY = 1
+    # Calls func on a DecimalArray of every sample at once, so func must
+    # accept one. The results are the scalar backend's.
+    DECIMAL_ARRAY = 2
 
 
 class IntegrationResult:
-    def __init__(self, min_x, max_x, trap) -> None:
+    def __init__(self, min_x, max_x, trap, converged=True) -> None:
         self.min = min_x
         self.max = max_x
         self.trap = trap
+        self.converged = converged
+
+
+class PrecisionResult(tuple):
+    """The (value, error) pair of integral_to_precision, and converged"""
+
+    def __new__(cls, value, error, converged=True):
+        result = tuple.__new__(cls, (value, error))
+        result.converged = converged
+        return result
+
+
+class IntegrationStats:
+    """Describes the work done by the latest call of an Integrator"""
+
+    def __init__(self, cache: FunctionCache = None):
+        self.__start = (0, 0) if cache is None else (cache.hits, cache.misses)
+        self.evaluations = 0
+        self.hits = 0
+        self.misses = 0
+        # Refinements of the candidates, or levels of Romberg or tanh-sinh
+        self.rounds = 0
+        self.max_candidates = 0
+        # The number of intervals the final answer is made of
+        self.partition_size = 0
+        # Work done in worker processes is not timed, it only counts towards
+        # evaluations
+        self.seconds = {'get_local_extrema': 0.0, 'output_range': 0.0}
+
+    def count(self, cache: FunctionCache):
+        self.hits = cache.hits - self.__start[0]
+        self.misses = cache.misses - self.__start[1]
+        self.evaluations = self.misses
+
+    def candidates(self, size: int):
+        self.partition_size = size
+        self.max_candidates = max(self.max_candidates, size)
+
+    def __repr__(self):
+        return f'IntegrationStats(evaluations={self.evaluations},' \
+               f'hits={self.hits},misses={self.misses},' \
+               f'rounds={self.rounds},max_candidates={self.max_candidates},' \
+               f'partition_size={self.partition_size},' \
+               f'seconds={self.seconds})'
 
 
 class Integrator:
@@ -29,24 +107,218 @@ class Integrator:
         self,
         zero_val: ComputationType,
         func: Callable[[ComputationType], ComputationType],
-        mode=Mode.FLUCTUATING
+        mode=Mode.FLUCTUATING,
+        backend=Backend.SCALAR,
+        cache: FunctionCache = None,
+        persistent_cache: bool = False,
     ) -> None:
+        """
+        Function values are remembered in cache, which is cleared around
+        every call unless persistent_cache is set.
+        """
+        if backend == Backend.NUMPY and not vectorized.numpy_available():
+            raise Exception('The NumPy backend requires numpy to be '
+                            'installed.')
+        if backend == Backend.DECIMAL_ARRAY \
+                and not isinstance(zero_val, DecimalNumber):
+            raise Exception('The DecimalArray backend requires DecimalNumber '
+                            'values.')
         self.zero_val = zero_val
         self.func = func
-        self.cache = {}
+        self.cache = UnboundedCache() if cache is None else cache
+        self.func_key = self.cache.function_key(func)
+        self.persistent_cache = persistent_cache
         self.mode = mode
+        self.backend = backend
+        self.array_func = None
+        self.__second_derivative = None
+        self.stats = IntegrationStats()
 
     def cached_func(self, x):
-        if x not in self.cache:
-            self.cache[x] = self.func(x)
-        return self.cache[x]
+        return self.cache.get(self.func_key, self.func, x)
+
+    def __start_stats(self):
+        self.stats = IntegrationStats(self.cache)
+
+    def __profiled(self, name, func, *args):
+        # Shows up in the Profiler tree of an active TimingContext too
+        start = time.perf_counter()
+        if TimingContext.singleton is None:
+            result = func(*args)
+        else:
+            with Profiler(name):
+                result = func(*args)
+        self.stats.seconds[name] += time.perf_counter() - start
+        return result
 
     def __reset_cache(self):
-        self.cache = {}
+        if not self.persistent_cache:
+            self.cache.clear()
+
+    def __get_array_func(self):
+        if self.array_func is None:
+            self.array_func = vectorized.lower(self.func)
+        return self.array_func
 
-    def __get_out_range(self, a, b):
+    def __lift(self, x: float):
+        return self.zero_val + float(x)
+
+    def __samples_per_panel(self, n, resolution):
         if self.mode == Mode.FLUCTUATING:
-            return output_range(self.cached_func, a, b)
+            return resolution
+        if self.mode in (Mode.INCREASING, Mode.DECREASING):
+            return 1
+        if self.mode == Mode.SHARED_GRID:
+            return max(1, -(-resolution // n))
+        raise Exception(f'Mode {str(self.mode)} is not supported.')
+
+    def __integrate_array(self, a, b, n, resolution, max_evaluations):
+        a = vectorized.to_float(a)
+        b = vectorized.to_float(b)
+        samples = self.__samples_per_panel(n, resolution)
+        d = (b - a) / n
+        panels = n
+        if max_evaluations is not None:
+            panels = min(n, max(0, (max_evaluations - 1) // samples))
+        sums = self.__array_panel_sums(a, a + panels * d, panels, samples) \
+            if panels > 0 else (0.0, 0.0, 0.0)
+        self.stats.partition_size = panels
+        if panels < n:
+            self.stats.partition_size += 1
+            sums = tuple(map(
+                sum, zip(sums, self.__array_panel_sums(
+                    a + panels * d, b, 1, samples
+                ))
+            ))
+        return IntegrationResult(
+            self.__lift(sums[1]),
+            self.__lift(sums[2]),
+            self.__lift(sums[0]),
+            panels == n,
+        )
+
+    def __array_panel_sums(self, a, b, n, samples):
+        ys = self.__get_array_func()(vectorized.panel_grid(a, b, n, samples))
+        self.stats.evaluations += ys.size
+        d = (b - a) / n
+        ends = ys[::samples]
+        trap = d * (ends[:-1] + ends[1:]).sum() / 2
+        if self.mode == Mode.INCREASING:
+            lower_values, upper_values = ends[:-1], ends[1:]
+        elif self.mode == Mode.DECREASING:
+            lower_values, upper_values = ends[1:], ends[:-1]
+        else:
+            windows = vectorized.panel_windows(ys, samples)
+            lower_values = windows.min(axis=1)
+            upper_values = windows.max(axis=1)
+        return trap, d * lower_values.sum(), d * upper_values.sum()
+
+    def __integrate_decimal_array(self, a, b, n, resolution,
+                                  max_evaluations):
+        # The panels' endpoints and samples are computed as the scalar
+        # backend computes them, and neighbouring panels share the sample on
+        # their common endpoint.
+        samples = self.__samples_per_panel(n, resolution)
+        panels = n
+        if max_evaluations is not None:
+            panels = min(n, max(0, (max_evaluations - 1) // samples))
+        d = (self.zero_val + b - a) / n
+        edges = [a + p * d for p in range(panels + 1)]
+        if panels < n:
+            edges.append(self.zero_val + b)
+        xs = [edges[0]]
+        for lower, upper in zip(edges, edges[1:]):
+            xs.extend(DecimalArray.grid(lower, upper, samples)[1:])
+        self.__reset_cache()
+        ys = DecimalArray(self.__cached_batch(xs))
+        min_y = self.zero_val
+        max_y = self.zero_val
+        trap = self.zero_val
+        for p in range(len(edges) - 1):
+            width = edges[p + 1] - edges[p]
+            start = ys[p * samples]
+            end = ys[(p + 1) * samples]
+            if self.mode == Mode.INCREASING:
+                low, high = start, end
+            elif self.mode == Mode.DECREASING:
+                low, high = end, start
+            else:
+                window = ys[p * samples:(p + 1) * samples + 1]
+                low, high = window.min(), window.max()
+            trap = trap + width * (start + end) / 2
+            min_y = min_y + width * low
+            max_y = max_y + width * high
+        self.stats.partition_size = len(edges) - 1
+        self.stats.count(self.cache)
+        self.__reset_cache()
+        return IntegrationResult(min_y, max_y, trap, panels == n)
+
+    def __batched_difference(self, a, b, xs):
+        # The difference function at xs, from a single call of func
+        ys = DecimalArray(self.__cached_batch(list(xs)))
+        fa = self.cached_func(a)
+        fb = self.cached_func(b)
+        return ys - ((fb - fa) * (xs - a) / (b - a) + fa)
+
+    def __batched_extrema(self, a, b, resolution):
+        xs = _extrema_points(a, b, resolution)
+        values = list(self.__batched_difference(a, b, DecimalArray(xs)))
+        return _local_extrema_of(xs, values, b)
+
+    def __cached_batch(self, xs):
+        return self.cache.get_many(self.func_key, self.__batch_func, xs)
+
+    def __batch_func(self, xs):
+        ys = self.func(DecimalArray(xs))
+        if not isinstance(ys, DecimalArray):
+            # A constant function returns a single number
+            return [ys] * len(xs)
+        return list(ys)
+
+    def __function_tree(self):
+        tree = function_of(self.func)
+        if tree is None:
+            raise Exception(f'Mode {str(self.mode)} requires func to be a '
+                            f'Function or the evaluate method of one.')
+        return tree
+
+    def __critical_points(self, a, b, resolution):
+        tree = function_of(self.func)
+        if tree is None:
+            derivative = self.__dual_derivative
+            try:
+                derivative(self.zero_val + a)
+            except TypeError:
+                raise Exception(f'Mode {str(self.mode)} requires func to '
+                                f'accept dual numbers.')
+            except (ArithmeticError, ValueError):
+                pass
+        else:
+            try:
+                derivative = differentiate(tree)
+            except NotImplementedError:
+                raise Exception(f'Mode {str(self.mode)} requires func to '
+                                f'be differentiable.')
+        return critical_points(
+            derivative, self.zero_val + a, self.zero_val + b, resolution
+        )
+
+    def __dual_derivative(self, x):
+        return derivative_at(self.func, x)
+
+    def __get_out_range(self, a, b, resolution=100, critical=()):
+        if self.mode in (Mode.FLUCTUATING, Mode.SHARED_GRID):
+            return self.__profiled(
+                'output_range', output_range, self.cached_func, a, b,
+                resolution,
+            )
+        elif self.mode == Mode.MONOTONE_PIECES:
+            values = list(map(
+                self.cached_func, [a, b] + [c for c in critical if a < c < b]
+            ))
+            return min(values), max(values)
+        elif self.mode == Mode.ENCLOSURE:
+            return enclose(self.__function_tree(), a, b)
         elif self.mode == Mode.INCREASING:
             return list(map(self.cached_func, [a, b]))
         elif self.mode == Mode.DECREASING:
@@ -54,28 +326,107 @@ class Integrator:
         else:
             raise Exception(f'Mode {str(self.mode)} is not supported.')
 
-    def __get_range_values(self, a, b):
-        ran = self.__get_out_range(a, b)
+    def __get_range_values(self, a, b, resolution=100, critical=()):
+        ran = self.__get_out_range(a, b, resolution, critical)
         return ((b - a) * (self.cached_func(a) + self.cached_func(b)) / 2,
                 (b - a) * ran[0],
                 (b - a) * ran[1])
 
-    def integrate(self, a, b, n):
+    def integrate(
+        self, a, b, n, resolution=100, max_evaluations=None, deadline=None
+    ):
+        """
+        Computes the trapezoid, lower and upper sums over n panels, stopping
+        early once max_evaluations or the monotonic deadline runs out
+        """
+        self.__start_stats()
+        # The array backends evaluate in one batch, so they only honour
+        # max_evaluations
+        if self.backend == Backend.NUMPY:
+            return self.__integrate_array(a, b, n, resolution, max_evaluations)
+        if self.backend == Backend.DECIMAL_ARRAY:
+            if self.mode in (Mode.MONOTONE_PIECES, Mode.ENCLOSURE):
+                raise Exception(f'Mode {str(self.mode)} is not supported by '
+                                f'the DecimalArray backend.')
+            return self.__integrate_decimal_array(
+                a, b, n, resolution, max_evaluations
+            )
+        if self.mode == Mode.SHARED_GRID:
+            # Roughly resolution samples are spread over the whole of [a, b]
+            # rather than over every panel. Neighbouring panels share the
+            # sample on their common endpoint through the cache.
+            resolution = self.__samples_per_panel(n, resolution)
+        critical = ()
+        if self.mode == Mode.MONOTONE_PIECES:
+            # The derivative is sampled resolution times across all of
+            # [a, b] to find its sign changes
+            critical = self.__critical_points(a, b, resolution)
         self.__reset_cache()
+        misses = self.cache.misses
         min_y = self.zero_val
         max_y = self.zero_val
         trap = self.zero_val
+        converged = True
         d = (self.zero_val + b - a) / n
         for p in range(0, n):
+            upper = a + (p + 1) * d
+            if _budget_exhausted(
+                self.cache.misses - misses, max_evaluations, deadline
+            ):
+                upper = self.zero_val + b
+                converged = False
             values = self.__get_range_values(
-                a + p * d,
-                a + (p + 1) * d
+                a + p * d, upper, resolution, critical
             )
             trap = trap + values[0]
             min_y = min_y + values[1]
             max_y = max_y + values[2]
+            self.stats.partition_size += 1
+            if not converged:
+                break
+        self.stats.count(self.cache)
         self.__reset_cache()
-        return IntegrationResult(min_y, max_y, trap)
+        return IntegrationResult(min_y, max_y, trap, converged)
+
+    def integrate_romberg(self, a, b, precision, max_level=20):
+        """Romberg integration, bounded by the last change of the estimate"""
+        self.__start_stats()
+        with localcontext(working_context(precision)) as context:
+            return self.__integrate_romberg(
+                context, a, b, precision, max_level
+            )
+
+    def __integrate_romberg(self, context, a, b, precision, max_level):
+        self.__reset_cache()
+        tolerance = (self.zero_val + 10) ** (-precision - 1) / 2
+        lower = self.zero_val + a
+        h = self.zero_val + b - a
+        row = [h * (self.cached_func(lower) + self.cached_func(lower + h)) / 2]
+        context.prec = max(context.prec, working_digits(precision, row[0]))
+        error = abs(row[0])
+        for level in range(1, max_level + 1):
+            h = h / 2
+            midpoints = self.zero_val
+            for n in range(2 ** (level - 1)):
+                midpoints = midpoints \
+                    + self.cached_func(lower + (2 * n + 1) * h)
+            previous_row = row
+            row = [previous_row[0] / 2 + h * midpoints]
+            for m in range(1, level + 1):
+                row.append(
+                    row[m - 1]
+                    + (row[m - 1] - previous_row[m - 1]) / (4 ** m - 1)
+                )
+            error = abs(row[-1] - previous_row[-1])
+            self.stats.rounds = level
+            if error < tolerance:
+                break
+        self.stats.partition_size = 2 ** self.stats.rounds
+        self.stats.count(self.cache)
+        self.__reset_cache()
+        return IntegrationResult(
+            row[-1] - error, row[-1] + error, row[-1], error < tolerance
+        )
 
     def difference_func(self, a, b):
         return lambda x: self.cached_func(x) - (
@@ -84,71 +435,532 @@ class Integrator:
         )
 
     def __get_difference_extrema(self, a, b, resolution=100):
-        return get_local_extrema(self.difference_func(a, b), a, b, resolution)
+        if self.backend == Backend.DECIMAL_ARRAY:
+            return self.__profiled(
+                'get_local_extrema', self.__batched_extrema, a, b, resolution
+            )
+        return self.__profiled(
+            'get_local_extrema', get_local_extrema,
+            self.difference_func(a, b), a, b, resolution,
+        )
 
     def __get_max_error_for_interval(self, a, b, resolution=100):
-        ran = output_range(self.difference_func(a, b), a, b, resolution)
+        if self.mode == Mode.ENCLOSURE:
+            return self.__get_enclosed_error_for_interval(a, b)
+        if self.backend == Backend.DECIMAL_ARRAY:
+            differences = self.__profiled(
+                'output_range', self.__batched_difference,
+                a, b, DecimalArray.grid(a, b, resolution),
+            )
+            return (b - a) * (differences.max() - differences.min())
+        ran = self.__profiled(
+            'output_range', output_range,
+            self.difference_func(a, b), a, b, resolution,
+        )
         return (b - a) * (ran[1] - ran[0])
 
+    def __get_enclosed_error_for_interval(self, a, b):
+        # Both the integral and the trapezoid lie between (b - a) times the
+        # bounds of func. The trapezoid is also within (b - a)^3 / 12 times
+        # the largest |f''| of the integral, which is far tighter on short
+        # intervals.
+        tree = self.__function_tree()
+        low, high = enclose(tree, a, b)
+        error = (b - a) * (high - low)
+        if self.__second_derivative is None:
+            self.__second_derivative = (second_derivative(tree),)
+        second = self.__second_derivative[0]
+        if second is None:
+            return error
+        try:
+            low, high = enclose(second, a, b)
+        except (ArithmeticError, NotImplementedError):
+            return error
+        curvature = maximum(abs(low), abs(high))
+        return minimum(error, (b - a) ** 3 * curvature / 12)
+
+    def refine_interval(self, lower, upper, resolution=4):
+        """
+        Splits [lower, upper] at the extrema of its difference function into
+        (lower, upper, error, f(lower), f(upper)) pieces
+        """
+        if self.mode == Mode.ENCLOSURE:
+            extrema_for_interval = [lower, (lower + upper) / 2, upper]
+        else:
+            extrema_for_interval = self.__get_difference_extrema(
+                lower, upper, resolution
+            )
+        if extrema_for_interval[0] != lower:
+            extrema_for_interval.insert(0, lower)
+        pieces = []
+        for m in range(1, len(extrema_for_interval)):
+            c = extrema_for_interval[m - 1]
+            d = extrema_for_interval[m]
+            pieces.append((
+                c, d, self.__get_max_error_for_interval(c, d, resolution),
+                self.cached_func(c), self.cached_func(d),
+            ))
+        return pieces
+
     def integral_to_precision(
+        self, a, b, precision, resolution=4,
+        error_func_lower=lambda x: 0, error_func_upper=lambda x: 0,
+        max_evaluations=None, deadline=None,
+    ):
+        """Stops early once max_evaluations or deadline runs out"""
+        tolerance = (self.zero_val + 10) ** (-precision - 1) / 2
+        estimate = error = self.zero_val
+        progression = self.integral_progression(
+            a, b, precision, resolution, error_func_lower, error_func_upper
+        )
+        for estimate, error, evaluations in progression:
+            if _budget_exhausted(evaluations, max_evaluations, deadline):
+                progression.close()
+                break
+        return PrecisionResult(
+            round(estimate, precision), error, error < tolerance
+        )
+
+    def integral_progression(
         self, a, b, precision, resolution=4,
         error_func_lower=lambda x: 0, error_func_upper=lambda x: 0
     ):
+        """
+        Yields (estimate, error_bound, evaluations) after every refinement
+        of integral_to_precision
+        """
+        _check_resolution(resolution)
+        self.__start_stats()
+        if self.backend == Backend.NUMPY:
+            yield from _stepped_in_context(
+                self.__integral_progression_array(
+                    a, b, precision, resolution,
+                    error_func_lower, error_func_upper,
+                ),
+                precision,
+            )
+            return
         self.__reset_cache()
-        if resolution < 2:
-            raise Exception('Resolution may not be smaller than 2. A resolution'
-                            ' of 1 will never identify any error in the results'
-                            ' because this will only evaluate the function at'
-                            ' its endpoints.')
+        lower, upper, trimmed_error, digits = self.__trimmed_bounds(
+            a, b, precision, error_func_lower, error_func_upper
+        )
+        try:
+            yield from _stepped_in_context(
+                self.__integral_progression(
+                    lower, upper, trimmed_error, precision, resolution
+                ),
+                precision, digits,
+            )
+        finally:
+            self.__reset_cache()
+
+    def __trimmed_bounds(
+        self, a, b, precision, error_func_lower, error_func_upper
+    ):
+        # Returns lower, upper, the error given up by trimming and the digits
+        # to work with. The trims are far smaller than the interval, and the
+        # functions that compute them usually cancel catastrophically, so
+        # they and every evaluation near the trimmed ends need about twice
+        # the digits of the working context.
+        digits = 2 * working_digits(precision)
+        with localcontext() as context:
+            context.prec = max(context.prec, digits)
+            tolerance = (self.zero_val + 10) ** (-precision - 1) / 2
+            allowed_error = tolerance / 10
+            lower = self.zero_val + a + error_func_lower(allowed_error)
+            upper = self.zero_val + b - error_func_upper(allowed_error)
+            trimmed_error = 0
+            if lower > a:
+                trimmed_error = trimmed_error + allowed_error
+            if upper < b:
+                trimmed_error = trimmed_error + allowed_error
+        return lower, upper, trimmed_error, digits if trimmed_error else 0
+
+    def __integral_progression(
+        self, lower, upper, trimmed_error, precision, resolution
+    ):
+        misses = self.cache.misses
         tolerance = (self.zero_val + 10) ** (-precision - 1) / 2
-        allowed_error = tolerance / 10
-        initial_candidate = [
-            self.zero_val + a + error_func_lower(allowed_error),
-            self.zero_val + b - error_func_upper(allowed_error),
-        ]
-        candidates = [initial_candidate]
-        errors = [self.__get_max_error_for_interval(
-            initial_candidate[0], initial_candidate[1], resolution
+
+        # The candidate with the largest error is always refined next. The
+        # counter breaks ties between equal errors so that intervals are
+        # never compared with each other.
+        total_error = self.__get_max_error_for_interval(
+            lower, upper, resolution
+        )
+        integral = (upper - lower) * (
+            self.cached_func(lower) + self.cached_func(upper)
+        ) / 2
+        candidates = [(-total_error, 0, lower, upper, integral)]
+        self.stats.candidates(1)
+        count = 1
+        while True:
+            converged = total_error + trimmed_error < tolerance
+            if converged:
+                # The running sums are recomputed so that the final answer
+                # does not carry any accumulated rounding.
+                total_error = 0
+                integral = 0
+                for negative_error, _, _, _, area in candidates:
+                    total_error = total_error - negative_error
+                    integral = integral + area
+            self.stats.count(self.cache)
+            yield integral, total_error + trimmed_error, \
+                self.cache.misses - misses
+            if converged:
+                return
+
+            negative_error, _, lower, upper, area = heappop(candidates)
+            total_error = total_error + negative_error
+            integral = integral - area
+            for c, d, error, c_val, d_val in self.refine_interval(
+                lower, upper, resolution
+            ):
+                area = (d - c) * (c_val + d_val) / 2
+                total_error = total_error + error
+                integral = integral + area
+                heappush(candidates, (-error, count, c, d, area))
+                count += 1
+            self.stats.rounds += 1
+            self.stats.candidates(len(candidates))
+
+    def integral_to_precision_parallel(
+        self, a, b, precision, resolution=4,
+        error_func_lower=lambda x: 0, error_func_upper=lambda x: 0,
+        executor: Executor = None, workers: int = None,
+        batch_size: int = None,
+    ):
+        """
+        integral_to_precision, refining the batch_size worst candidates of
+        every round on executor. With a process pool, func must be picklable
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if executor is None:
+            with ProcessPoolExecutor(workers) as pool:
+                return self.integral_to_precision_parallel(
+                    a, b, precision, resolution,
+                    error_func_lower, error_func_upper,
+                    pool, workers, batch_size,
+                )
+        _check_resolution(resolution)
+        if batch_size is None:
+            batch_size = 4 * workers
+        self.__start_stats()
+        with localcontext(working_context(precision)) as context:
+            return self.__integral_to_precision_parallel(
+                context, a, b, precision, resolution,
+                error_func_lower, error_func_upper,
+                executor, workers, batch_size,
+            )
+
+    def __integral_to_precision_parallel(
+        self, context, a, b, precision, resolution,
+        error_func_lower, error_func_upper, executor, workers, batch_size,
+    ):
+        self.__reset_cache()
+        tolerance = (self.zero_val + 10) ** (-precision - 1) / 2
+        lower, upper, trimmed_error, digits = self.__trimmed_bounds(
+            a, b, precision, error_func_lower, error_func_upper
+        )
+        context.prec = max(context.prec, digits)
+
+        error = self.__get_max_error_for_interval(lower, upper, resolution)
+        candidates = [(
+            -error, 0, lower, upper,
+            self.cached_func(lower), self.cached_func(upper),
         )]
-        sample = []
-        total_error = 0
-        if initial_candidate[0] > a:
-            total_error = total_error + allowed_error
-        if initial_candidate[1] < b:
-            total_error = total_error + allowed_error
-
-        while sum(errors) + total_error >= tolerance:
-            new_candidates = []
-            new_errors = []
-            for n in range(len(candidates)):
-                if (candidates[n][1] - candidates[n][0]) * tolerance \
-                        > (b - a) * errors[n]:
-                    sample.append(candidates[n])
-                    total_error = total_error + errors[n]
-                else:
-                    extrema_for_interval = self.__get_difference_extrema(
-                        candidates[n][0], candidates[n][1], resolution
-                    )
-                    for m in range(1, len(extrema_for_interval)):
-                        candidate = [
-                            extrema_for_interval[m - 1], extrema_for_interval[m]
-                        ]
-                        new_candidates.append(candidate)
-                        new_errors.append(self.__get_max_error_for_interval(
-                            candidate[0], candidate[1], resolution
-                        ))
-            candidates = new_candidates
-            errors = new_errors
-
-        sample.extend(candidates)
-        total_error = total_error + sum(errors)
+        context.prec = max(context.prec, working_digits(
+            precision, (upper - lower) * (candidates[0][4] + candidates[0][5])
+        ))
+        count = 1
+        total_error = error
+        worker_evaluations = 0
+        while total_error + trimmed_error >= tolerance:
+            batch = []
+            while candidates and len(batch) < batch_size:
+                negative_error, _, lower, upper, _, _ = heappop(candidates)
+                total_error = total_error + negative_error
+                batch.append((lower, upper))
+            futures = [
+                executor.submit(
+                    _refine_intervals,
+                    self.zero_val, self.func, self.mode, batch[n::workers],
+                    resolution, context.prec,
+                )
+                for n in range(min(workers, len(batch)))
+            ]
+            for future in futures:
+                pieces, evaluations = future.result()
+                worker_evaluations += evaluations
+                for c, d, error, c_val, d_val in pieces:
+                    total_error = total_error + error
+                    heappush(candidates, (-error, count, c, d, c_val, d_val))
+                    count += 1
+            self.stats.rounds += 1
+            self.stats.candidates(len(candidates))
+
+        total_error = trimmed_error
         integral = 0
-        for interval in sample:
-            integral = integral + (interval[1] - interval[0]) * (
-                self.cached_func(interval[0]) + self.cached_func(interval[1])
-            ) / 2
+        for negative_error, _, lower, upper, lower_val, upper_val \
+                in candidates:
+            total_error = total_error - negative_error
+            integral = integral + (upper - lower) * (lower_val + upper_val) / 2
+        self.stats.candidates(len(candidates))
+        self.stats.count(self.cache)
+        self.stats.evaluations += worker_evaluations
+        self.__reset_cache()
+        return PrecisionResult(
+            round(integral, precision), total_error, total_error < tolerance
+        )
+
+    def __integral_progression_array(
+        self, a, b, precision, resolution, error_func_lower, error_func_upper
+    ):
+        # Every candidate interval of a refinement round is sampled in one
+        # batched call. The samples that give an interval's error also
+        # locate the extrema used to split it.
+        func = self.__get_array_func()
+        a = vectorized.to_float(a)
+        b = vectorized.to_float(b)
+        tolerance = 10.0 ** (-precision - 1) / 2
+        allowed_error = tolerance / 10
+        # The trimmed bounds are found in the integrator's own number type
+        # because error functions tend to cancel catastrophically in floats.
+        with localcontext() as context:
+            context.prec = max(context.prec, 2 * working_digits(precision))
+            lower_trim = vectorized.to_float(
+                error_func_lower(self.zero_val + allowed_error)
+            )
+            upper_trim = vectorized.to_float(
+                error_func_upper(self.zero_val + allowed_error)
+            )
+        lows = vectorized.np.array([a + lower_trim])
+        highs = vectorized.np.array([b - upper_trim])
+        if lower_trim > 0 and lows[0] == a \
+                or upper_trim > 0 and highs[0] == b:
+            raise Exception(f'Precision {precision} requires trimming the '
+                            f'interval by less than float64 can resolve. Use'
+                            f' the scalar backend instead.')
+        total_error = 0.0
+        if lows[0] > a:
+            total_error += allowed_error
+        if highs[0] < b:
+            total_error += allowed_error
+        integral = 0.0
+        # Intervals that are accepted leave the candidates for good
+        finished = 0
+
+        xs, ends, errors, splits = vectorized.survey(
+            func, lows, highs, resolution
+        )
+        evaluations = xs.size
+        while True:
+            estimate = integral \
+                + ((highs - lows) * ends.sum(axis=1)).sum() / 2
+            error = total_error + errors.sum()
+            self.stats.evaluations = evaluations
+            self.stats.max_candidates = max(
+                self.stats.max_candidates, len(lows)
+            )
+            self.stats.partition_size = finished + len(lows)
+            yield self.__lift(estimate), self.__lift(error), evaluations
+            if error < tolerance:
+                return
+
+            widths = highs - lows
+            accepted = widths * tolerance > (b - a) * errors
+            total_error += errors[accepted].sum()
+            integral += (
+                widths[accepted] * ends[accepted].sum(axis=1)
+            ).sum() / 2
+            splits[accepted] = False
+            finished += int(accepted.sum())
+            lows, highs = vectorized.split(xs, splits)
+            xs, ends, errors, splits = vectorized.survey(
+                func, lows, highs, resolution
+            )
+            evaluations += xs.size
+            self.stats.rounds += 1
+
+    def __from_decimal(self, d: Decimal):
+        if isinstance(self.zero_val, float):
+            return float(d)
+        return self.zero_val + d
+
+    def __gauss_kronrod_rule(self, order):
+        digits = 17 if isinstance(self.zero_val, float) \
+            else getcontext().prec
+        return tuple(
+            list(map(self.__from_decimal, values))
+            for values in gauss_kronrod(order, digits)
+        )
+
+    def __gauss_kronrod_estimate(self, rule, a, b):
+        center = (a + b) / 2
+        half_width = (b - a) / 2
+        kronrod = self.zero_val
+        gauss = self.zero_val
+        for x, kronrod_weight, gauss_weight in zip(*rule):
+            y = self.cached_func(center + half_width * x)
+            kronrod = kronrod + kronrod_weight * y
+            gauss = gauss + gauss_weight * y
+        return half_width * kronrod, abs(half_width * (kronrod - gauss))
+
+    def integral_gauss_kronrod(
+        self, a, b, precision, order=7, max_intervals=10000
+    ):
+        """Adaptive Gauss-Kronrod quadrature, bisecting the worst interval"""
+        self.__start_stats()
+        with localcontext(working_context(precision)):
+            return self.__integral_gauss_kronrod(
+                a, b, precision, order, max_intervals
+            )
+
+    def __integral_gauss_kronrod(
+        self, a, b, precision, order, max_intervals
+    ):
         self.__reset_cache()
-        return round(integral, precision), total_error
+        tolerance = (self.zero_val + 10) ** (-precision - 1) / 2
+        rule = self.__gauss_kronrod_rule(order)
+        lower = self.zero_val + a
+        upper = self.zero_val + b
+        integral, total_error = self.__gauss_kronrod_estimate(
+            rule, lower, upper
+        )
+        # The counter breaks ties between equal errors so that intervals are
+        # never compared with each other.
+        heap = [(-total_error, 0, lower, upper, integral)]
+        self.stats.candidates(1)
+        count = 1
+        while total_error >= tolerance and len(heap) < max_intervals:
+            negative_error, _, lower, upper, value = heappop(heap)
+            integral = integral - value
+            total_error = total_error + negative_error
+            middle = (lower + upper) / 2
+            for c, d in ((lower, middle), (middle, upper)):
+                value, error = self.__gauss_kronrod_estimate(rule, c, d)
+                integral = integral + value
+                total_error = total_error + error
+                heappush(heap, (-error, count, c, d, value))
+                count += 1
+            self.stats.rounds += 1
+            self.stats.candidates(len(heap))
+
+        integral = self.zero_val
+        total_error = self.zero_val
+        for negative_error, _, _, _, value in heap:
+            integral = integral + value
+            total_error = total_error - negative_error
+        self.stats.count(self.cache)
+        self.__reset_cache()
+        return PrecisionResult(
+            round(integral, precision), total_error, total_error < tolerance
+        )
+
+    def integral_tanh_sinh(self, a, b, precision, max_level=12):
+        """Tanh-sinh quadrature, for integrable singularities at a and b"""
+        self.__start_stats()
+        # Nodes that round onto a singular endpoint are skipped, which costs
+        # about half of the digits carried
+        with localcontext(working_context(2 * precision)):
+            return self.__integral_tanh_sinh(a, b, precision, max_level)
+
+    def __integral_tanh_sinh(self, a, b, precision, max_level):
+        self.__reset_cache()
+        tolerance = (self.zero_val + 10) ** (-precision - 1) / 2
+        digits = 17 if isinstance(self.zero_val, float) \
+            else getcontext().prec
+        lower = self.zero_val + a
+        upper = self.zero_val + b
+        half_width = (upper - lower) / 2
+        estimate = None
+        error = None
+        # The sliver between each endpoint and the closest node to it. Twice
+        # its width times the value at its edge bounds the missing integral
+        # for singularities up to an inverse square root.
+        slivers = {}
+        for level in range(max_level + 1):
+            total = self.zero_val
+            for complement, weight in tanh_sinh(level, digits):
+                if complement == 1:
+                    total = total + self.__from_decimal(weight) \
+                        * self.cached_func(lower + half_width)
+                    continue
+                offset = half_width * self.__from_decimal(complement)
+                for endpoint, x in ((lower, lower + offset),
+                                    (upper, upper - offset)):
+                    if not lower < x < upper:
+                        continue
+                    y = self.cached_func(x)
+                    total = total + self.__from_decimal(weight) * y
+                    width = abs(x - endpoint)
+                    if endpoint not in slivers \
+                            or width < slivers[endpoint][0]:
+                        slivers[endpoint] = (width, abs(y))
+            tail = sum((2 * w * y for w, y in slivers.values()), 0)
+            step = self.__from_decimal(Decimal(2) ** -level)
+            previous = estimate
+            estimate = step * half_width * total
+            self.stats.rounds = level
+            if previous is not None:
+                estimate = estimate + previous / 2
+                error = abs(estimate - previous) + tail
+                if error < tolerance:
+                    break
+        self.stats.count(self.cache)
+        self.__reset_cache()
+        return PrecisionResult(
+            round(estimate, precision), error, error < tolerance
+        )
+
+
+def _budget_exhausted(evaluations, max_evaluations, deadline):
+    return max_evaluations is not None and evaluations >= max_evaluations \
+        or deadline is not None and time.monotonic() >= deadline
+
+
+def _refine_intervals(zero_val, func, mode, intervals, resolution, digits):
+    # Runs in a worker process, so it may only receive picklable arguments.
+    # Workers do not inherit the caller's decimal context. The number of
+    # evaluations is returned along with the pieces.
+    integrator = Integrator(zero_val, func, mode)
+    pieces = []
+    with localcontext() as context:
+        context.prec = digits
+        for lower, upper in intervals:
+            pieces.extend(
+                integrator.refine_interval(lower, upper, resolution)
+            )
+    return pieces, integrator.cache.misses
+
+
+def _check_resolution(resolution):
+    if resolution < 2:
+        raise Exception('Resolution may not be smaller than 2. A resolution'
+                        ' of 1 will never identify any error in the results'
+                        ' because this will only evaluate the function at'
+                        ' its endpoints.')
+
+
+def _stepped_in_context(steps, places, digits=0):
+    # A generator that entered a decimal context would leak it to its
+    # consumer at every yield, so the context is entered around each step
+    # instead. It has at least digits digits and grows with the magnitude
+    # of the estimates.
+    context = working_context(places)
+    context.prec = max(context.prec, digits)
+    try:
+        while True:
+            with localcontext(context):
+                try:
+                    step = next(steps)
+                except StopIteration:
+                    return
+            context.prec = max(context.prec, working_digits(places, step[0]))
+            yield step
+    finally:
+        steps.close()
 
 
 def integrate_exact(func, a, b):
@@ -162,8 +974,13 @@ def integrate_exact(func, a, b):
         )
         return anti_derivative.evaluate(exact_b) \
             - anti_derivative.evaluate(exact_a)
+    if isinstance(func, Polynomial):
+        anti_derivative = Polynomial(0, *(
+            to_exact(c) / (n + 1) for n, c in enumerate(func.coefficients)
+        ))
+        upper, lower = anti_derivative.evaluate_many([exact_b, exact_a])
+        return upper - lower
     if isinstance(func, FunctionSum) \
-            or isinstance(func, Polynomial) \
             or isinstance(func, SimpleFunction):
         return sum(map(
             lambda x: integrate_exact(x, exact_a, exact_b),
@@ -203,15 +1020,23 @@ def output_range(func, lower, upper, resolution=100):
 
 
 def get_local_extrema(func, a, b, resolution=100):
+    xs = _extrema_points(a, b, resolution)
+    return _local_extrema_of(xs, list(map(func, xs)), b)
+
+
+def _extrema_points(a, b, resolution):
+    return [a] + [a + (b - a) * n / resolution
+                  for n in range(1, resolution + 1)]
+
+
+def _local_extrema_of(xs, values, end):
+    # get_local_extrema over samples that were already taken
     last_direction = 0
-    last_x = a
-    last_val = func(last_x)
+    last_x = xs[0]
+    last_val = values[0]
     local_extrema = []
-    for n in range(1, resolution + 1):
-        x = a + (b - a) * n / resolution
-        val = func(x)
+    for x, val in zip(xs[1:], values[1:]):
         direction = val - last_val
-
         if last_direction <= 0 < direction:
             local_extrema.append(last_x)
         if direction < 0 <= last_direction:
@@ -219,5 +1044,5 @@ def get_local_extrema(func, a, b, resolution=100):
         last_x = x
         last_val = val
         last_direction = direction
-    local_extrema.append(b)
+    local_extrema.append(end)
     return local_extrema
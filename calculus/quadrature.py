@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from math import cos, pi
+from typing import List, Tuple
+
+# The extra digits carried while nodes and weights are generated. Solving
+# for the Kronrod weights loses a handful of digits to conditioning.
+_NODE_GUARD_DIGITS = 20
+
+
+def legendre(n: int) -> List[Fraction]:
+    """
+    Returns the coefficients of the Legendre polynomial P_n, lowest power
+    first.
+    """
+    previous = [Fraction(1)]
+    current = [Fraction(0), Fraction(1)]
+    if n == 0:
+        return previous
+    for k in range(1, n):
+        # (k + 1) P_{k+1} = (2k + 1) x P_k - k P_{k-1}
+        following = [Fraction(0)] + [(2 * k + 1) * c for c in current]
+        for m, c in enumerate(previous):
+            following[m] -= k * c
+        previous = current
+        current = [c / (k + 1) for c in following]
+    return current
+
+
+def _moment(m: int) -> Fraction:
+    # The integral of x^m over [-1, 1]
+    if m % 2 == 1:
+        return Fraction(0)
+    return Fraction(2, m + 1)
+
+
+def stieltjes(n: int) -> List[Fraction]:
+    """
+    Returns the coefficients of the monic Stieltjes polynomial E_{n+1},
+    lowest power first
+    """
+    # Its roots are the Kronrod nodes. It is orthogonal to x^k P_n(x) for
+    # k = 0, ..., n.
+    p = legendre(n)
+    unknowns = list(range(n + 1))
+    rows = []
+    for k in range(n + 1):
+        def weighted_moment(j):
+            return sum(
+                (c * _moment(i + j + k) for i, c in enumerate(p)),
+                Fraction(0),
+            )
+        rows.append(
+            [weighted_moment(j) for j in unknowns]
+            + [-weighted_moment(n + 1)]
+        )
+    solution = _solve_exact(rows, len(unknowns))
+    return solution + [Fraction(1)]
+
+
+def _solve_exact(rows: List[List[Fraction]], size: int) -> List[Fraction]:
+    # Gauss-Jordan elimination that tolerates redundant equations. Any
+    # unknown without a pivot is free and is taken to be zero, which is the
+    # choice that respects the parity of E_{n+1}.
+    pivots = []
+    r = 0
+    for col in range(size):
+        pivot = next(
+            (i for i in range(r, len(rows)) if rows[i][col] != 0), None
+        )
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        scale = rows[r][col]
+        rows[r] = [v / scale for v in rows[r]]
+        for i in range(len(rows)):
+            if i != r and rows[i][col] != 0:
+                factor = rows[i][col]
+                rows[i] = [v - factor * w for v, w in zip(rows[i], rows[r])]
+        pivots.append(col)
+        r += 1
+    solution = [Fraction(0)] * size
+    for i, col in enumerate(pivots):
+        solution[col] = rows[i][-1]
+    return solution
+
+
+def _evaluate(coefficients: List[Decimal], x: Decimal) -> Decimal:
+    result = Decimal(0)
+    for c in reversed(coefficients):
+        result = result * x + c
+    return result
+
+
+def _derivative(coefficients: List[Decimal]) -> List[Decimal]:
+    return [m * c for m, c in enumerate(coefficients)][1:]
+
+
+def _bisect(coefficients: List[Decimal], lower: float, upper: float):
+    f = [float(c) for c in coefficients]
+
+    def value(x):
+        result = 0.0
+        for c in reversed(f):
+            result = result * x + c
+        return result
+
+    lower_sign = value(lower) > 0
+    for _ in range(60):
+        middle = (lower + upper) / 2
+        if (value(middle) > 0) == lower_sign:
+            lower = middle
+        else:
+            upper = middle
+    return (lower + upper) / 2
+
+
+def _newton(coefficients: List[Decimal], x: Decimal, digits: int):
+    derivative = _derivative(coefficients)
+    tolerance = Decimal(10) ** (-digits)
+    for _ in range(100):
+        step = _evaluate(coefficients, x) / _evaluate(derivative, x)
+        x -= step
+        if abs(step) <= tolerance:
+            break
+    return x
+
+
+def _solve_decimal(
+    rows: List[List[Decimal]], size: int
+) -> List[Decimal]:
+    # Gaussian elimination with partial pivoting
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda i: abs(rows[i][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for i in range(col + 1, size):
+            factor = rows[i][col] / rows[col][col]
+            rows[i] = [v - factor * w for v, w in zip(rows[i], rows[col])]
+    solution = [Decimal(0)] * size
+    for i in reversed(range(size)):
+        total = rows[i][-1] - sum(
+            (rows[i][j] * solution[j] for j in range(i + 1, size)),
+            Decimal(0),
+        )
+        solution[i] = total / rows[i][i]
+    return solution
+
+
+@lru_cache(maxsize=32)
+def gauss_kronrod(
+    n: int, digits: int
+) -> Tuple[Tuple[Decimal, ...], Tuple[Decimal, ...], Tuple[Decimal, ...]]:
+    """
+    Returns the 2n + 1 Kronrod nodes on [-1, 1] with their Kronrod and Gauss
+    weights, correct to digits significant digits
+    """
+    # The Gauss weight is zero at the nodes only the Kronrod rule has
+    with localcontext() as context:
+        context.prec = digits + _NODE_GUARD_DIGITS
+        p = [Decimal(c.numerator) / c.denominator for c in legendre(n)]
+        e = [Decimal(c.numerator) / c.denominator for c in stieltjes(n)]
+
+        gauss_guesses = sorted(
+            cos(pi * (i + 0.75) / (n + 0.5)) for i in range(n)
+        )
+        gauss_nodes = [
+            _newton(p, Decimal(repr(x)), context.prec - 2)
+            for x in gauss_guesses
+        ]
+        # The Kronrod nodes interlace with the Gauss nodes.
+        brackets = [-1.0] + [float(x) for x in gauss_nodes] + [1.0]
+        kronrod_nodes = [
+            _newton(
+                e, Decimal(repr(_bisect(e, lower, upper))), context.prec - 2
+            )
+            for lower, upper in zip(brackets[:-1], brackets[1:])
+        ]
+
+        p_prime = _derivative(p)
+        gauss_weights = {
+            x: 2 / ((1 - x * x) * _evaluate(p_prime, x) ** 2)
+            for x in gauss_nodes
+        }
+        nodes = sorted(gauss_nodes + kronrod_nodes)
+        size = len(nodes)
+        rows = []
+        powers = [Decimal(1)] * size
+        for m in range(size):
+            rows.append(powers + [
+                Decimal(2) / (m + 1) if m % 2 == 0 else Decimal(0)
+            ])
+            powers = [w * x for w, x in zip(powers, nodes)]
+        kronrod_weights = _solve_decimal(rows, size)
+
+    with localcontext() as context:
+        context.prec = digits
+        return (
+            tuple(+x for x in nodes),
+            tuple(+w for w in kronrod_weights),
+            tuple(+gauss_weights.get(x, Decimal(0)) for x in nodes),
+        )
+
+
+@lru_cache(maxsize=8)
+def decimal_pi(digits: int) -> Decimal:
+    """
+    Returns pi to the given number of significant digits. This is the
+    series from the recipes in the documentation of the decimal module.
+    """
+    with localcontext() as context:
+        context.prec = digits + 2
+        three = Decimal(3)
+        last, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != last:
+            last = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+    with localcontext() as context:
+        context.prec = digits
+        return +s
+
+
+@lru_cache(maxsize=256)
+def tanh_sinh(
+    level: int, digits: int
+) -> Tuple[Tuple[Decimal, Decimal], ...]:
+    """
+    Returns the (complement, weight) pairs that level adds to the tanh-sinh
+    rule
+    """
+    # The node t = tanh(pi / 2 sinh(k h)) and its mirror image -t crowd
+    # towards the endpoints, so the complement 1 - t is computed without
+    # cancellation. The weight leaves out the step h. Finer levels only add
+    # the odd k, and nodes stop once they cannot be told from the endpoint.
+    with localcontext() as context:
+        context.prec = digits + _NODE_GUARD_DIGITS
+        half_pi = decimal_pi(context.prec) / 2
+        h = Decimal(2) ** -level
+        smallest = Decimal(10) ** -digits
+        k = 0 if level == 0 else 1
+        step = 1 if level == 0 else 2
+        nodes = []
+        while True:
+            u = k * h
+            e_u = u.exp()
+            e_v = (half_pi * (e_u - 1 / e_u) / 2).exp()
+            complement = 2 / (e_v * e_v + 1)
+            if complement < smallest:
+                break
+            weight = half_pi * (e_u + 1 / e_u) * 2 / (e_v + 1 / e_v) ** 2
+            nodes.append((complement, weight))
+            k += step
+
+    with localcontext() as context:
+        context.prec = digits
+        return tuple((+c, +w) for c, w in nodes)
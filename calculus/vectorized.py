@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from custom_numbers.types import Convertable
+from elementary_functions.calculus_utils import ConstantFunction
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.power import PowerFunction
+from elementary_functions.simple import CharacteristicFunction, SimpleFunction
+from elementary_functions.utils import CompositeFunction, FunctionProd, \
+    FunctionSum, function_of
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ArrayFunction = Callable[['np.ndarray'], 'np.ndarray']
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def to_float(x) -> float:
+    if isinstance(x, Convertable):
+        return float(x.to_decimal())
+    return float(x)
+
+
+def lower(func) -> ArrayFunction:
+    """Lowers func to a callable that evaluates a whole float64 array"""
+    tree = function_of(func)
+    if tree is not None:
+        return lower_function(tree)
+    return _lower_callable(func)
+
+
+def _lower_callable(func) -> ArrayFunction:
+    # func is tried on the array itself and, failing that, mapped over it
+    # one float at a time
+    def elementwise(xs):
+        return np.fromiter(
+            (to_float(func(float(x))) for x in xs.flat),
+            dtype=float,
+            count=xs.size,
+        ).reshape(xs.shape)
+
+    def array_func(xs):
+        try:
+            ys = func(xs)
+        except (TypeError, AttributeError):
+            return elementwise(xs)
+        if not isinstance(ys, np.ndarray) or ys.shape != xs.shape \
+                or ys.dtype.kind != 'f':
+            return elementwise(xs)
+        return ys
+
+    return array_func
+
+
+def lower_function(func) -> ArrayFunction:
+    if isinstance(func, Polynomial):
+        coefficients = list(map(to_float, func.coefficients)) or [0.0]
+        return lambda xs: np.polynomial.polynomial.polyval(xs, coefficients)
+    if isinstance(func, PowerFunction):
+        power = to_float(func.power)
+        coefficient = to_float(func.coefficient)
+        if power == 0:
+            return lambda xs: np.full(np.shape(xs), coefficient)
+        return lambda xs: coefficient * np.power(xs, power)
+    if isinstance(func, ConstantFunction):
+        val = to_float(func.val)
+        return lambda xs: np.full(np.shape(xs), val)
+    if isinstance(func, FunctionSum) or isinstance(func, SimpleFunction):
+        summands = list(map(lower_function, func.constituents))
+        return lambda xs: sum(
+            (f(xs) for f in summands), np.zeros(np.shape(xs))
+        )
+    if isinstance(func, FunctionProd):
+        factors = list(map(lower_function, func.constituents))
+        if len(factors) == 0:
+            raise ArithmeticError
+        return lambda xs: np.prod([f(xs) for f in factors], axis=0)
+    if isinstance(func, CompositeFunction):
+        outer = lower_function(func.outer)
+        inner = lower_function(func.inner)
+        return lambda xs: outer(inner(xs))
+    if isinstance(func, CharacteristicFunction):
+        return _lower_characteristic(func)
+    # function_of would hand the evaluate method straight back as func
+    return _lower_callable(func.evaluate)
+
+
+def _lower_characteristic(func: CharacteristicFunction) -> ArrayFunction:
+    a = to_float(func.domain.a)
+    b = to_float(func.domain.b)
+    coefficient = to_float(func.coefficient)
+
+    def array_func(xs):
+        inside = (xs > a) & (xs < b)
+        if func.domain.include_left:
+            inside |= xs == a
+        if func.domain.include_right:
+            inside |= xs == b
+        return np.where(inside, coefficient, 0.0)
+
+    return array_func
+
+
+def panel_grid(a: float, b: float, n: int, samples_per_panel: int):
+    xs = np.linspace(a, b, n * samples_per_panel + 1)
+    xs[-1] = b
+    return xs
+
+
+def panel_windows(ys, samples_per_panel: int):
+    """
+    Returns one row per panel holding every sample taken on that panel,
+    including both of its endpoints.
+    """
+    return np.lib.stride_tricks.sliding_window_view(
+        ys, samples_per_panel + 1
+    )[::samples_per_panel]
+
+
+def survey(func: ArrayFunction, lows, highs, resolution: int):
+    """
+    output_range and get_local_extrema for every interval in a single
+    batched call. Returns xs, endpoint values, errors and the split mask.
+    """
+    widths = highs - lows
+    steps = np.arange(resolution + 1) / resolution
+    xs = lows[:, None] + widths[:, None] * steps
+    xs[:, -1] = highs
+    ys = func(xs)
+    first = ys[:, :1]
+    last = ys[:, -1:]
+    difference = ys - (first + (last - first) * steps)
+    errors = widths * (difference.max(axis=1) - difference.min(axis=1))
+
+    directions = np.diff(difference, axis=1)
+    last_directions = np.concatenate(
+        (np.zeros((len(lows), 1)), directions[:, :-1]), axis=1
+    )
+    splits = np.zeros(xs.shape, dtype=bool)
+    splits[:, :-1] = (last_directions <= 0) & (directions > 0) \
+        | (directions < 0) & (last_directions >= 0)
+    splits[:, -1] = True
+    return xs, ys[:, [0, -1]], errors, splits
+
+
+def split(xs, splits):
+    """Turns the split points marked by survey into new intervals"""
+    rows, cols = np.nonzero(splits)
+    points = xs[rows, cols]
+    same_interval = rows[1:] == rows[:-1]
+    return points[:-1][same_interval], points[1:][same_interval]
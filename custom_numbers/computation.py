@@ -1,15 +1,62 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from decimal import Context, Decimal, getcontext, localcontext
 from math import inf, isinf
-from typing import Callable
+import operator
+from typing import Callable, Iterable, List
 
 from custom_numbers.types import Numeric, Convertable
 
+# The significant digits carried beyond those that a result needs, so that
+# rounding in the intermediate steps does not reach the digits that are kept.
+GUARD_DIGITS = 10
+
+
+def working_digits(places: int, magnitude: Numeric = 0) -> int:
+    """
+    The significant digits needed to carry a value of the given magnitude to
+    the given number of decimal places, including guard digits.
+    """
+    digits = places + GUARD_DIGITS
+    magnitude = DecimalNumber.of(magnitude)
+    if magnitude.inf_type == 0 and magnitude.d != 0:
+        digits += max(0, magnitude.d.adjusted() + 1)
+    return max(digits, GUARD_DIGITS)
+
+
+def working_context(places: int, magnitude: Numeric = 0) -> Context:
+    """
+    Returns a copy of the current decimal context whose precision is sized by
+    working_digits rather than fixed at the global default.
+    """
+    context = getcontext().copy()
+    context.prec = working_digits(places, magnitude)
+    return context
+
 
 class DecimalNumber(Convertable):
+    """A Decimal that may also be positive or negative infinity"""
+    # Instances are immutable, so the common constants are shared. Arithmetic
+    # dispatches on the exact type of the other operand first, because
+    # isinstance checks against this class cost more than the operation.
+    __slots__ = ('d', 'inf_type')
+
+    ZERO: DecimalNumber
+    ONE: DecimalNumber
+    INF: DecimalNumber
+    NEG_INF: DecimalNumber
+
     @staticmethod
     def of(x: Numeric) -> DecimalNumber:
+        t = type(x)
+        if t is DecimalNumber:
+            return x
+        if t is int:
+            if x == 0:
+                return DecimalNumber.ZERO
+            if x == 1:
+                return DecimalNumber.ONE
+            return DecimalNumber(Decimal(x))
         if isinstance(x, Decimal):
             return DecimalNumber(x)
         if isinstance(x, DecimalNumber):
@@ -32,8 +79,8 @@ class DecimalNumber(Convertable):
     def of_float(f: float):
         if isinf(f):
             if f < 0:
-                return DecimalNumber(inf_type=-1)
-            return DecimalNumber(inf_type=1)
+                return DecimalNumber.NEG_INF
+            return DecimalNumber.INF
         return DecimalNumber(Decimal(str(f)))
 
     @staticmethod
@@ -44,6 +91,25 @@ class DecimalNumber(Convertable):
             return DecimalNumber.of_float(-inf)
         return DecimalNumber(Decimal(s))
 
+    @staticmethod
+    def sum_many(values) -> DecimalNumber:
+        """Adds up DecimalNumbers and builtin numbers in one pass"""
+        values = iter(values)
+        total = Decimal(0)
+        for value in values:
+            t = type(value)
+            if t is DecimalNumber:
+                if value.inf_type != 0:
+                    return DecimalNumber(inf_type=value.inf_type)
+                total += value.d
+                continue
+            d = _builtin_decimal(value)
+            if d is None:
+                return DecimalNumber(total) + value \
+                    + DecimalNumber.sum_many(values)
+            total += d
+        return DecimalNumber(total)
+
     def __init__(
         self, d: Decimal = None,
         inf_type: int = 0
@@ -70,30 +136,36 @@ class DecimalNumber(Convertable):
         action: Callable[[int | Decimal], DecimalNumber],
         or_else: Callable[[], any]
     ):
-        if isinstance(other, int) or isinstance(other, Decimal):
-            return action(other)
-        if isinstance(other, float):
-            return action(DecimalNumber.float_to_dec(other))
-        return or_else()
+        d = _builtin_decimal(other)
+        if d is None and not isinstance(other, float):
+            return or_else()
+        return action(d)
 
     def __add__(self, other):
+        if type(other) is DecimalNumber:
+            if self.inf_type != 0:
+                return DecimalNumber(inf_type=self.inf_type)
+            if other.inf_type != 0:
+                return DecimalNumber(inf_type=other.inf_type)
+            return DecimalNumber(self.d + other.d)
         if self.inf_type != 0:
             return DecimalNumber(inf_type=self.inf_type)
-        if isinstance(other, DecimalNumber):
+        d = _builtin_decimal(other)
+        if d is not None:
+            return DecimalNumber(self.d + d)
+        if _is_decimal_number(other):
             if other.inf_type != 0:
                 return DecimalNumber(inf_type=other.inf_type)
             return DecimalNumber(self.d + other.d)
-        return self.do_for_builtins(
-            other,
-            lambda x: DecimalNumber(self.d + x),
-            lambda: other.__radd__(self)
-        )
+        if isinstance(other, float):
+            return DecimalNumber(self.d + d)
+        return other.__radd__(self)
 
     def __radd__(self, other):
         return self + other
 
     def __mul__(self, other):
-        if isinstance(other, DecimalNumber):
+        if _is_decimal_number(other):
             if self.inf_type != 0:
                 if other.inf_type != 0:
                     return DecimalNumber(
@@ -107,11 +179,10 @@ class DecimalNumber(Convertable):
             if other < 0:
                 return DecimalNumber(inf_type=-self.inf_type)
             return DecimalNumber(inf_type=self.inf_type)
-        return self.do_for_builtins(
-            other,
-            lambda x: DecimalNumber(self.d * x),
-            lambda: other.__rmul__(self)
-        )
+        d = _builtin_decimal(other)
+        if d is not None or isinstance(other, float):
+            return DecimalNumber(self.d * d)
+        return other.__rmul__(self)
 
     def __rmul__(self, other):
         return self * other
@@ -119,44 +190,55 @@ class DecimalNumber(Convertable):
     def __pow__(self, power, modulo=None):
         if self.inf_type != 0:
             raise NotImplementedError
-        if isinstance(power, DecimalNumber):
+        t = type(power)
+        if t is int:
+            return DecimalNumber(pow(self.d, power, modulo))
+        if _is_decimal_number(power):
             return DecimalNumber(pow(self.d, power.d, modulo))
-        return self.do_for_builtins(
-            power,
-            lambda x: DecimalNumber(pow(self.d, Decimal(x), modulo)),
-            lambda: NotImplemented
-        )
+        d = _builtin_decimal(power)
+        if d is not None:
+            return DecimalNumber(pow(self.d, Decimal(d), modulo))
+        return NotImplemented
 
     def __sub__(self, other):
+        if type(other) is DecimalNumber:
+            if self.inf_type == 0 and other.inf_type == 0:
+                return DecimalNumber(self.d - other.d)
+        elif self.inf_type == 0:
+            d = _builtin_decimal(other)
+            if d is not None:
+                return DecimalNumber(self.d - d)
         return self + -other
 
     def __rsub__(self, other):
+        if self.inf_type == 0:
+            d = _builtin_decimal(other)
+            if d is not None:
+                return DecimalNumber(d - self.d)
         return -self + other
 
     def __truediv__(self, other):
         if self.inf_type != 0:
             return self
-        if isinstance(other, DecimalNumber):
+        if _is_decimal_number(other):
             if other.inf_type != 0:
-                return DecimalNumber.of(0)
+                return DecimalNumber.ZERO
             return DecimalNumber(self.d / other.d)
-        return self.do_for_builtins(
-            other,
-            lambda x: DecimalNumber(self.d / x),
-            lambda _: other.__rtruediv__(self)
-        )
+        d = _builtin_decimal(other)
+        if d is not None or isinstance(other, float):
+            return DecimalNumber(self.d / d)
+        return other.__rtruediv__(self)
 
     def __rtruediv__(self, other):
         if self.inf_type != 0:
-            return DecimalNumber.of(0)
-        return self.do_for_builtins(
-            other,
-            lambda x: DecimalNumber(x / self.d),
-            lambda _: other.__truediv__(self)
-        )
+            return DecimalNumber.ZERO
+        d = _builtin_decimal(other)
+        if d is not None or isinstance(other, float):
+            return DecimalNumber(d / self.d)
+        return other.__truediv__(self)
 
     def __eq__(self, other):
-        if isinstance(other, DecimalNumber):
+        if _is_decimal_number(other):
             if self.inf_type * other.inf_type < 0:
                 return False
             return self.d == other.d
@@ -179,21 +261,31 @@ class DecimalNumber(Convertable):
     def __lt__(self, other):
         if self.inf_type != 0:
             return self.inf_type < 0
-        if isinstance(other, DecimalNumber):
+        if _is_decimal_number(other):
             if other.inf_type != 0:
                 return other.inf_type > 0
             return self.d < other.d
-        if isinstance(other, Convertable):
+        if type(other) not in _BUILTIN_TYPES \
+                and isinstance(other, Convertable):
             return self.d < other.to_decimal()
         return self.d < other
 
     def __le__(self, other):
+        if type(other) is DecimalNumber and self.inf_type == 0 \
+                and other.inf_type == 0:
+            return self.d <= other.d
         return self == other or self < other
 
     def __gt__(self, other):
+        if type(other) is DecimalNumber and self.inf_type == 0 \
+                and other.inf_type == 0:
+            return self.d > other.d
         return -self < -other
 
     def __ge__(self, other):
+        if type(other) is DecimalNumber and self.inf_type == 0 \
+                and other.inf_type == 0:
+            return self.d >= other.d
         return self == other or self > other
 
     def __neg__(self):
@@ -203,6 +295,8 @@ class DecimalNumber(Convertable):
         )
 
     def __abs__(self):
+        if self.inf_type == 0 and not self.d.is_signed():
+            return self
         return DecimalNumber(
             None if self.d is None else abs(self.d),
             abs(self.inf_type)
@@ -211,5 +305,214 @@ class DecimalNumber(Convertable):
     def __round__(self, n: int = None):
         if self.inf_type != 0:
             return self
-        # noinspection PyTypeChecker
-        return DecimalNumber(round(self.d, n))
+        if n is None:
+            # noinspection PyTypeChecker
+            return DecimalNumber(round(self.d, n))
+        # Rounding to n places must not fail just because the current
+        # context carries fewer digits than the rounded value needs.
+        with localcontext() as context:
+            context.prec = max(context.prec, self.d.adjusted() + n + 2)
+            return DecimalNumber(round(self.d, n))
+
+
+class DecimalArray:
+    """Many Decimal values that are operated on together, elementwise"""
+    # Each element is computed exactly as the same operation on DecimalNumbers
+    # would compute it, in the array's context or else the current one.
+    # Infinities are stored as Decimal infinities.
+    __slots__ = ('values', 'context')
+
+    of = staticmethod(DecimalNumber.of)
+
+    @staticmethod
+    def grid(lower, upper, resolution: int, context: Context = None):
+        """The points that output_range samples on [lower, upper]"""
+        lower = _array_value(lower)
+        upper = _array_value(upper)
+        with localcontext(context):
+            width = upper - lower
+            values = [lower] + [
+                lower + width * n / resolution for n in range(1, resolution)
+            ] + [upper]
+        return DecimalArray._wrap(values, context)
+
+    @staticmethod
+    def _wrap(values: List[Decimal], context: Context) -> DecimalArray:
+        array = DecimalArray.__new__(DecimalArray)
+        array.values = values
+        array.context = context
+        return array
+
+    def __init__(self, values: Iterable, context: Context = None):
+        self.values: List[Decimal] = list(map(_array_value, values))
+        self.context = context
+
+    def __repr__(self):
+        return f'DecimalArray({",".join(map(str, self.values))})'
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return DecimalArray._wrap(self.values[item], self.context)
+        return _number_of(self.values[item])
+
+    def __iter__(self):
+        return map(_number_of, self.values)
+
+    def __apply(self, other, op, reflected=False):
+        if type(other) is DecimalArray:
+            if len(other.values) != len(self.values):
+                raise Exception(f'Arrays of {len(self.values)} and '
+                                f'{len(other.values)} values cannot be '
+                                f'combined.')
+            with localcontext(self.context):
+                values = list(map(op, self.values, other.values))
+            return DecimalArray._wrap(values, self.context)
+        other = _array_scalar(other)
+        if other is None:
+            return NotImplemented
+        with localcontext(self.context):
+            if reflected:
+                values = [op(other, a) for a in self.values]
+            else:
+                values = [op(a, other) for a in self.values]
+        return DecimalArray._wrap(values, self.context)
+
+    def __add__(self, other):
+        return self.__apply(other, operator.add)
+
+    def __radd__(self, other):
+        return self.__apply(other, operator.add, True)
+
+    def __sub__(self, other):
+        return self.__apply(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self.__apply(other, operator.sub, True)
+
+    def __mul__(self, other):
+        return self.__apply(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self.__apply(other, operator.mul, True)
+
+    def __truediv__(self, other):
+        return self.__apply(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self.__apply(other, operator.truediv, True)
+
+    def __pow__(self, power, modulo=None):
+        return self.__apply(power, operator.pow)
+
+    def __rpow__(self, other):
+        return self.__apply(other, operator.pow, True)
+
+    def __neg__(self):
+        with localcontext(self.context):
+            return DecimalArray._wrap(
+                [-a for a in self.values], self.context
+            )
+
+    def __abs__(self):
+        with localcontext(self.context):
+            return DecimalArray._wrap(
+                [abs(a) for a in self.values], self.context
+            )
+
+    def __compare(self, other, op) -> List[bool]:
+        if type(other) is DecimalArray:
+            return list(map(op, self.values, other.values))
+        other = _array_scalar(other)
+        return [op(a, other) for a in self.values]
+
+    def __eq__(self, other):
+        return self.__compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self.__compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self.__compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self.__compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self.__compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self.__compare(other, operator.ge)
+
+    __hash__ = None
+
+    def min(self) -> DecimalNumber:
+        return _number_of(min(self.values))
+
+    def max(self) -> DecimalNumber:
+        return _number_of(max(self.values))
+
+    def sum(self) -> DecimalNumber:
+        with localcontext(self.context):
+            total = Decimal(0)
+            for a in self.values:
+                total += a
+        return _number_of(total)
+
+
+DecimalNumber.ZERO = DecimalNumber(Decimal(0))
+DecimalNumber.ONE = DecimalNumber(Decimal(1))
+DecimalNumber.INF = DecimalNumber(inf_type=1)
+DecimalNumber.NEG_INF = DecimalNumber(inf_type=-1)
+
+
+def _is_decimal_number(x) -> bool:
+    t = type(x)
+    return t is DecimalNumber \
+        or t not in _BUILTIN_TYPES and isinstance(x, DecimalNumber)
+
+
+_BUILTIN_TYPES = (int, float, Decimal)
+
+
+def _builtin_decimal(other):
+    # The Decimal, or int, that an operand of a builtin type stands for, or
+    # None for any other operand.
+    t = type(other)
+    if t is int or t is Decimal:
+        return other
+    if t is float:
+        return DecimalNumber.float_to_dec(other)
+    if isinstance(other, (int, Decimal)):
+        return other
+    if isinstance(other, float):
+        # Such as numpy.float64
+        return DecimalNumber.float_to_dec(float(other))
+    return None
+
+
+def _number_of(d: Decimal) -> DecimalNumber:
+    if d.is_infinite():
+        return DecimalNumber.NEG_INF if d < 0 else DecimalNumber.INF
+    return DecimalNumber(d)
+
+
+def _array_scalar(x):
+    # The Decimal, or int, that a single number contributes to an array
+    # operation, or None when it is not a number DecimalArray knows.
+    if _is_decimal_number(x):
+        if x.inf_type != 0:
+            return Decimal(x.inf_type) * Decimal('Infinity')
+        return x.d
+    if isinstance(x, float) and isinf(x):
+        return Decimal(x)
+    return _builtin_decimal(x)
+
+
+def _array_value(x) -> Decimal:
+    value = _array_scalar(x)
+    if value is None:
+        raise Exception(f'{x} cannot be held by a DecimalArray.')
+    return Decimal(value)
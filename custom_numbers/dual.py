@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from custom_numbers.types import Numeric, Convertable
+
+
+class DualNumber(Convertable):
+    """A value paired with its derivative, a + a'e where e * e = 0"""
+
+    @staticmethod
+    def of(x: Numeric) -> DualNumber:
+        if isinstance(x, DualNumber):
+            return DualNumber(x.value, x.derivative)
+        return DualNumber(x)
+
+    def __init__(self, value: Numeric, derivative: Numeric = 0):
+        self.value = value
+        self.derivative = derivative
+
+    def __str__(self):
+        return f'{self.value} + {self.derivative}e'
+
+    def __repr__(self):
+        return f'DualNumber(value={self.value},derivative={self.derivative})'
+
+    def to_decimal(self) -> Decimal:
+        if isinstance(self.value, Convertable):
+            return self.value.to_decimal()
+        return Decimal(self.value)
+
+    def __add__(self, other):
+        if isinstance(other, DualNumber):
+            return DualNumber(
+                self.value + other.value, self.derivative + other.derivative
+            )
+        return DualNumber(self.value + other, self.derivative)
+
+    def __radd__(self, other):
+        return DualNumber(other + self.value, self.derivative)
+
+    def __sub__(self, other):
+        return self + -other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        if isinstance(other, DualNumber):
+            return DualNumber(
+                self.value * other.value,
+                self.derivative * other.value + self.value * other.derivative
+            )
+        return DualNumber(self.value * other, self.derivative * other)
+
+    def __rmul__(self, other):
+        return DualNumber(other * self.value, other * self.derivative)
+
+    def __truediv__(self, other):
+        if isinstance(other, DualNumber):
+            quotient = self.value / other.value
+            return DualNumber(
+                quotient,
+                (self.derivative - quotient * other.derivative) / other.value
+            )
+        return DualNumber(self.value / other, self.derivative / other)
+
+    def __rtruediv__(self, other):
+        quotient = other / self.value
+        return DualNumber(
+            quotient, -quotient * self.derivative / self.value
+        )
+
+    def __pow__(self, power, modulo=None):
+        if isinstance(power, DualNumber):
+            if power.derivative != 0:
+                raise NotImplementedError
+            power = power.value
+        value = self.value ** power
+        if self.derivative == 0:
+            return DualNumber(value, self.derivative)
+        if power == 1:
+            return DualNumber(value, self.derivative)
+        if self.value == 0:
+            return DualNumber(
+                value, power * self.value ** (power - 1) * self.derivative
+            )
+        # Reusing the value saves computing a second power
+        return DualNumber(
+            value, power * value / self.value * self.derivative
+        )
+
+    def __neg__(self):
+        return DualNumber(-self.value, -self.derivative)
+
+    def __abs__(self):
+        if self.value < 0:
+            return -self
+        return self
+
+    def __round__(self, n: int = None):
+        return DualNumber(round(self.value, n), self.derivative)
+
+    def __eq__(self, other):
+        if isinstance(other, DualNumber):
+            return self.value == other.value
+        return self.value == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __lt__(self, other):
+        if isinstance(other, DualNumber):
+            return self.value < other.value
+        return self.value < other
+
+    def __le__(self, other):
+        return self == other or self < other
+
+    def __gt__(self, other):
+        if isinstance(other, DualNumber):
+            return self.value > other.value
+        return self.value > other
+
+    def __ge__(self, other):
+        return self == other or self > other
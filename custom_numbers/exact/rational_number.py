@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import sys
 from decimal import Decimal
+from math import gcd
 
 from custom_numbers.exact.types import ExactNumber, ExactZero
 from custom_numbers.types import Numeric
-from custom_numbers.utils import gcd
 
 
 class RationalNumber(ExactNumber):
+    """numerator / denominator, reduced lazily"""
+    # Arithmetic works on the unreduced terms. They are reduced the first
+    # time numerator or denominator is read or the number is hashed.
+    __slots__ = ('_numerator', '_denominator', '_normalized')
+
     @staticmethod
     def from_float(f: float):
         if f < 0:
@@ -54,25 +60,42 @@ class RationalNumber(ExactNumber):
     def __init__(self, numerator: int = 0, denominator: int = 1):
         if denominator == 0:
             raise NotImplementedError
-        if denominator > 1000000000000:
-            self.numerator, self.denominator = Decimal(str(
-                numerator / denominator
-            )).as_integer_ratio()
-            return
-        c = gcd(numerator, denominator)
+        if type(numerator) is not int or type(denominator) is not int:
+            numerator, denominator = _integer_ratio(numerator, denominator)
         if denominator < 0:
-            c = -c
-        self.numerator = numerator // c
-        self.denominator = denominator // c
+            numerator = -numerator
+            denominator = -denominator
+        self._numerator = numerator
+        self._denominator = denominator
+        self._normalized = denominator == 1
+        if denominator.bit_length() > _LAZY_BITS:
+            # Sums of many terms would otherwise grow without bound
+            self.__normalize()
+
+    def __normalize(self):
+        c = gcd(self._numerator, self._denominator)
+        if c != 1:
+            self._numerator //= c
+            self._denominator //= c
+        self._normalized = True
+
+    @property
+    def numerator(self) -> int:
+        if not self._normalized:
+            self.__normalize()
+        return self._numerator
+
+    @property
+    def denominator(self) -> int:
+        if not self._normalized:
+            self.__normalize()
+        return self._denominator
 
     def to_decimal(self) -> Decimal:
-        return Decimal(self.numerator) / Decimal(self.denominator)
+        return Decimal(self._numerator) / Decimal(self._denominator)
 
     def flip(self) -> RationalNumber:
-        return RationalNumber(
-            self.denominator,
-            self.numerator,
-        )
+        return RationalNumber(self._denominator, self._numerator)
 
     def __str__(self):
         if self.denominator == 1:
@@ -80,26 +103,38 @@ class RationalNumber(ExactNumber):
         return str(self.to_decimal())
 
     def __add__(self, other):
+        if type(other) is int:
+            return RationalNumber(
+                self._numerator + other * self._denominator,
+                self._denominator,
+            )
         if not isinstance(other, RationalNumber) \
                 and isinstance(other, ExactNumber):
             return other + self
         summand = self.of(other)
-        new_denominator = self.denominator * summand.denominator
-        new_numerator = self.numerator * summand.denominator \
-            + summand.numerator * self.denominator
-        return RationalNumber(new_numerator, new_denominator)
+        if self._denominator == summand._denominator:
+            return RationalNumber(
+                self._numerator + summand._numerator, self._denominator
+            )
+        return RationalNumber(
+            self._numerator * summand._denominator
+            + summand._numerator * self._denominator,
+            self._denominator * summand._denominator,
+        )
 
     def __radd__(self, other):
         return self + other
 
     def __mul__(self, other):
+        if type(other) is int:
+            return RationalNumber(self._numerator * other, self._denominator)
         try:
             multiplicand = self.of(other)
         except NotImplementedError:
             return other.__rmul__(self)
         return RationalNumber(
-            self.numerator * multiplicand.numerator,
-            self.denominator * multiplicand.denominator,
+            self._numerator * multiplicand._numerator,
+            self._denominator * multiplicand._denominator,
         )
 
     def __rmul__(self, other):
@@ -109,12 +144,11 @@ class RationalNumber(ExactNumber):
         exponent = self.of(power)
         if exponent.denominator == 1 and not modulo:
             if exponent.numerator < 0:
-                return RationalNumber(self.denominator, self.numerator) \
-                       ** -exponent
+                return self.flip() ** -exponent
             return RationalNumber(
                 self.numerator ** exponent.numerator,
                 self.denominator ** exponent.numerator,
-                )
+            )
         raise NotImplementedError
 
     def __sub__(self, other):
@@ -135,24 +169,39 @@ class RationalNumber(ExactNumber):
 
     def __eq__(self, other):
         if isinstance(other, RationalNumber):
-            return self.numerator * other.denominator == \
-                   self.denominator * other.numerator
-        return self.numerator == self.denominator * other
+            return self._numerator * other._denominator == \
+                   self._denominator * other._numerator
+        return self._numerator == self._denominator * other
 
     def __req__(self, other):
         return self == other
 
     def __hash__(self):
-        return hash(self.to_decimal())
+        # The hash of a Fraction, which agrees with int, float and Decimal
+        try:
+            inverse = pow(self.denominator, -1, _HASH_MODULUS)
+        except ValueError:
+            result = sys.hash_info.inf
+        else:
+            result = hash(hash(abs(self.numerator)) * inverse)
+        if self.numerator < 0:
+            result = -result
+        return -2 if result == -1 else result
 
     def __ne__(self, other):
         return not (self == other)
 
     def __lt__(self, other):
-        return self.numerator < self.denominator * other
+        if isinstance(other, RationalNumber):
+            return self._numerator * other._denominator \
+                < other._numerator * self._denominator
+        return self._numerator < self._denominator * other
 
     def __le__(self, other):
-        return self.numerator <= self.denominator * other
+        if isinstance(other, RationalNumber):
+            return self._numerator * other._denominator \
+                <= other._numerator * self._denominator
+        return self._numerator <= self._denominator * other
 
     def __gt__(self, other):
         return not (self <= other)
@@ -161,18 +210,37 @@ class RationalNumber(ExactNumber):
         return not (self < other)
 
     def __neg__(self):
-        return RationalNumber(-self.numerator, self.denominator)
+        return RationalNumber(-self._numerator, self._denominator)
 
     def __abs__(self):
-        if self.numerator >= 0:
-            return RationalNumber(self.numerator, self.denominator)
+        if self._numerator >= 0:
+            return self
         return -self
 
     def __round__(self, n=None):
         new_denominator = 10 ** n
         new_numerator, remainder = divmod(
-            self.numerator * new_denominator, self.denominator
+            self._numerator * new_denominator, self._denominator
         )
-        if remainder * 2 >= self.denominator:
+        if remainder * 2 >= self._denominator:
             new_numerator += 1
         return RationalNumber(new_numerator, new_denominator)
+
+
+def _integer_ratio(numerator, denominator) -> tuple[int, int]:
+    # Integral floats and Decimals, such as the values of a LinearSystem,
+    # are converted exactly
+    n, m = _as_integer_ratio(numerator)
+    p, q = _as_integer_ratio(denominator)
+    return n * q, m * p
+
+
+def _as_integer_ratio(x) -> tuple[int, int]:
+    if isinstance(x, int):
+        return int(x), 1
+    return x.as_integer_ratio()
+
+
+# Unreduced denominators are allowed to grow to this many bits
+_LAZY_BITS = 64
+_HASH_MODULUS = sys.hash_info.modulus
@@ -7,7 +7,7 @@ from custom_numbers.types import ConvertableNumberABC, Numeric, N
 
 
 class ExactNumber(ConvertableNumberABC, ABC):
-    pass
+    __slots__ = ()
 
 
 class ExactZero(ExactNumber):
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from math import factorial
+from typing import List
+
+from custom_numbers.types import Numeric, Convertable
+
+
+class Jet(Convertable):
+    """
+    A Taylor series truncated after a fixed order, where coefficients[n] is
+    the n-th derivative divided by n!
+    """
+
+    @staticmethod
+    def of(x: Numeric) -> Jet:
+        if isinstance(x, Jet):
+            return Jet(*x.coefficients)
+        return Jet(x)
+
+    @staticmethod
+    def variable(x: Numeric, order: int) -> Jet:
+        """The jet of the identity at x, carried to the given order"""
+        if order == 0:
+            return Jet(x)
+        return Jet(x, x - x + 1, *((x - x,) * (order - 1)))
+
+    def __init__(self, *coefficients: Numeric):
+        if len(coefficients) == 0:
+            raise ArithmeticError
+        self.coefficients: List[Numeric] = list(coefficients)
+
+    @property
+    def value(self):
+        return self.coefficients[0]
+
+    @property
+    def order(self) -> int:
+        return len(self.coefficients) - 1
+
+    def derivative(self, n: int):
+        """Returns the n-th derivative, or 0 beyond the order"""
+        if n > self.order:
+            return self.value - self.value
+        return self.coefficients[n] * factorial(n)
+
+    def derivatives(self) -> list:
+        return [self.derivative(n) for n in range(self.order + 1)]
+
+    def __str__(self):
+        return ' + '.join(
+            f'{c}h^{n}' if n > 1 else (f'{c}h' if n == 1 else str(c))
+            for n, c in enumerate(self.coefficients)
+        )
+
+    def __repr__(self):
+        return f'Jet({",".join(map(str, self.coefficients))})'
+
+    def to_decimal(self) -> Decimal:
+        if isinstance(self.value, Convertable):
+            return self.value.to_decimal()
+        return Decimal(self.value)
+
+    def __add__(self, other):
+        if not isinstance(other, Jet):
+            return Jet(self.value + other, *self.coefficients[1:])
+        shorter, longer = sorted(
+            (self.coefficients, other.coefficients), key=len
+        )
+        return Jet(*(
+            [a + b for a, b in zip(self.coefficients, other.coefficients)]
+            + longer[len(shorter):]
+        ))
+
+    def __radd__(self, other):
+        return Jet(other + self.value, *self.coefficients[1:])
+
+    def __sub__(self, other):
+        return self + -other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        if not isinstance(other, Jet):
+            return Jet(*(c * other for c in self.coefficients))
+        a = self.coefficients
+        b = other.coefficients
+        return Jet(*(
+            _dot(a, b, max(0, n - len(b) + 1), min(n, len(a) - 1), n)
+            for n in range(max(len(a), len(b)))
+        ))
+
+    def __rmul__(self, other):
+        return Jet(*(other * c for c in self.coefficients))
+
+    def __truediv__(self, other):
+        if not isinstance(other, Jet):
+            return Jet(*(c / other for c in self.coefficients))
+        return self * other.__reciprocal(max(self.order, other.order))
+
+    def __rtruediv__(self, other):
+        return other * self.__reciprocal(self.order)
+
+    def __reciprocal(self, order: int) -> Jet:
+        # (1 / b)_n = -(b_1 q_(n-1) + ... + b_n q_0) / b_0
+        b = self.coefficients
+        q = [1 / b[0]]
+        for n in range(1, order + 1):
+            total = None
+            for j in range(1, min(n, len(b) - 1) + 1):
+                term = b[j] * q[n - j]
+                total = term if total is None else total + term
+            q.append(q[0] - q[0] if total is None else -total * q[0])
+        return Jet(*q)
+
+    def __pow__(self, power, modulo=None):
+        if isinstance(power, Jet):
+            if any(c != 0 for c in power.coefficients[1:]):
+                raise NotImplementedError
+            power = power.value
+        if isinstance(power, int):
+            if power < 0:
+                return 1 / self ** -power
+            return self.__int_power(power)
+        a = self.coefficients
+        if a[0] == 0:
+            raise ArithmeticError(f'The jet of x^({power}) is not defined '
+                                  f'at 0.')
+        # With u = a^p, a u' = p a' u gives
+        # u_n = ((p + 1) j - n) a_j u_(n-j) summed over j, over n a_0
+        u = [a[0] ** power]
+        for n in range(1, len(a)):
+            total = None
+            for j in range(1, n + 1):
+                term = ((power + 1) * j - n) * a[j] * u[n - j]
+                total = term if total is None else total + term
+            u.append(total / (n * a[0]))
+        return Jet(*u)
+
+    def __int_power(self, power: int) -> Jet:
+        result = None
+        square = self
+        while power > 0:
+            if power % 2 == 1:
+                result = square if result is None else result * square
+            power //= 2
+            if power > 0:
+                square = square * square
+        if result is None:
+            return Jet(self.value - self.value + 1)
+        return result
+
+    def __neg__(self):
+        return Jet(*(-c for c in self.coefficients))
+
+    def __abs__(self):
+        if self.value < 0:
+            return -self
+        return self
+
+    def __round__(self, n: int = None):
+        return Jet(round(self.value, n), *self.coefficients[1:])
+
+    def __eq__(self, other):
+        if isinstance(other, Jet):
+            return self.value == other.value
+        return self.value == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __lt__(self, other):
+        if isinstance(other, Jet):
+            return self.value < other.value
+        return self.value < other
+
+    def __le__(self, other):
+        return self == other or self < other
+
+    def __gt__(self, other):
+        if isinstance(other, Jet):
+            return self.value > other.value
+        return self.value > other
+
+    def __ge__(self, other):
+        return self == other or self > other
+
+
+def _dot(a, b, start, stop, n):
+    # a_start b_(n-start) + ... + a_stop b_(n-stop)
+    total = a[start] * b[n - start]
+    for j in range(start + 1, stop + 1):
+        total = total + a[j] * b[n - j]
+    return total
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from bisect import bisect_right
+from functools import lru_cache
+from math import gcd, isqrt
+from typing import Dict, List, Tuple
 
 
 class PrimeFactorization:
@@ -39,31 +42,161 @@ def next_prime(max_val: int, sorted_odd_primes: List[int]) -> int:
         return 3
     candidate = sorted_odd_primes[-1] + 2
     while candidate <= max_val:
-        is_prime = True
-        for p in sorted_odd_primes:
-            if candidate % p == 0:
-                is_prime = False
-                break
-        if is_prime:
+        if is_prime(candidate):
             return candidate
         candidate += 2
 
 
-def factor(n: int) -> PrimeFactorization:
-    remainder = n
-    x = 2
-    odd_primes = []
-    factors = {2: 0}
-    while remainder > 1:
-        next_remainder, test = divmod(remainder, x)
-        if test == 0:
-            factors[x] += 1
-            remainder = next_remainder
+class PrimeSieve:
+    """The primes up to limit, found with a segmented sieve of Eratosthenes"""
+
+    def __init__(self):
+        self.primes: List[int] = [2, 3, 5, 7]
+        self.limit = 10
+
+    def primes_up_to(self, limit: int) -> List[int]:
+        if limit > self.limit:
+            self.__extend(max(limit, 2 * self.limit))
+        return self.primes[:bisect_right(self.primes, limit)]
+
+    def __extend(self, limit: int):
+        # The segment (self.limit, limit] is sieved by the primes up to its
+        # square root, which are found first.
+        self.primes_up_to(isqrt(limit))
+        start = self.limit + 1
+        is_prime = bytearray([1]) * (limit - self.limit)
+        for p in self.primes:
+            if p * p > limit:
+                break
+            first = max(p * p, -(-start // p) * p)
+            is_prime[first - start::p] = bytes(len(range(first, limit + 1, p)))
+        self.primes.extend(
+            start + n for n, flag in enumerate(is_prime) if flag
+        )
+        self.limit = limit
+
+
+SIEVE = PrimeSieve()
+
+# Factors below this bound are found by trial division with the sieve's
+# primes, larger ones with Pollard's rho.
+_TRIAL_LIMIT = 1000
+# Miller-Rabin with these bases is exact below 3.3 * 10^24, and wrong
+# with negligible probability above it.
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in _WITNESSES:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
             continue
-        x = next_prime(remainder, odd_primes)
-        odd_primes.append(x)
-        factors[x] = 0
-    return PrimeFactorization(factors)
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_brent(n: int) -> int:
+    # A proper divisor of the odd composite n, by Brent's variant of
+    # Pollard's rho. The polynomial x^2 + c is tried for c = 1, 2, ... so
+    # the result does not depend on chance.
+    for c in range(1, n):
+        y = 2
+        r = 1
+        q = 1
+        g = 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            # The batched product skipped past the divisor, so the last
+            # batch is retraced one step at a time.
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    raise ArithmeticError(f'{n} could not be factored.')
+
+
+# The most recent primes above _TRIAL_LIMIT that were found. Radicals are
+# mostly multiplied by and raised to powers of numbers that were factored
+# before, so these are divided out before resorting to Pollard's rho.
+_LARGE_PRIMES: Dict[int, None] = {}
+_LARGE_PRIMES_SIZE = 4096
+
+
+def _remember(p: int):
+    if p >= _TRIAL_LIMIT and p not in _LARGE_PRIMES:
+        if len(_LARGE_PRIMES) >= _LARGE_PRIMES_SIZE:
+            del _LARGE_PRIMES[next(iter(_LARGE_PRIMES))]
+        _LARGE_PRIMES[p] = None
+
+
+def _large_prime_factors(n: int) -> List[int]:
+    # The prime factors, with multiplicity, of n > 1 without any factors
+    # below _TRIAL_LIMIT
+    if n < _TRIAL_LIMIT ** 2 or is_prime(n):
+        _remember(n)
+        return [n]
+    known = next((p for p in _LARGE_PRIMES if n % p == 0), None)
+    if known is not None:
+        return [known] + _large_prime_factors(n // known)
+    root = isqrt(n)
+    if root * root == n:
+        return 2 * _large_prime_factors(root)
+    d = _pollard_brent(n)
+    return _large_prime_factors(d) + _large_prime_factors(n // d)
+
+
+@lru_cache(maxsize=4096)
+def _factors(n: int) -> Tuple[Tuple[int, int], ...]:
+    factors = {}
+    remainder = n
+    for p in SIEVE.primes_up_to(_TRIAL_LIMIT):
+        if p * p > remainder:
+            break
+        while remainder % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            remainder //= p
+    if remainder > 1:
+        for p in _large_prime_factors(remainder):
+            factors[p] = factors.get(p, 0) + 1
+    return tuple(sorted(factors.items()))
+
+
+def factor(n: int) -> PrimeFactorization:
+    """
+    The primes dividing n, mapped to their multiplicities. Factorizations
+    are remembered, so factoring the same number again is a lookup.
+    """
+    return PrimeFactorization(dict(_factors(n)))
 
 
 # (a/b)^(1/p)+(c/d)^(1/q)
@@ -82,6 +82,8 @@ class Numeric(Protocol):
 
 @runtime_checkable
 class Convertable(Protocol):
+    __slots__ = ()
+
     @staticmethod
     @abstractmethod
     def of(x: Numeric) -> N:
@@ -103,6 +105,8 @@ class FlippableNumber(Protocol):
 
 
 class NumericABC(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __str__(self):
         pass
@@ -177,6 +181,8 @@ class NumericABC(ABC):
 
 
 class ConvertableNumberABC(NumericABC):
+    __slots__ = ()
+
     @staticmethod
     @abstractmethod
     def of(x: Numeric) -> N:
@@ -14,17 +14,11 @@ def maximum(a, b):
 
 
 def gcd(a: int, b: int):
-    if a < 0 or b < 0:
-        return gcd(abs(a), abs(b))
-    if a == 0:
-        return b
-    if b == 0:
-        return a
-
-    n = maximum(a, b)
-    m = minimum(a, b)
-
-    return gcd(m, n % m)
+    a = abs(a)
+    b = abs(b)
+    while b != 0:
+        a, b = b, a % b
+    return a
 
 
 def newton_int_sqrt(x: int) -> int:
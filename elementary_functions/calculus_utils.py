@@ -98,6 +98,10 @@ class ConstantFunction(DifferentiableFunction):
             return self.val == 1
         return other == self
 
+    def __hash__(self):
+        # ConstantFunction(c) equals PowerFunction(0, c)
+        return hash((self.val, 0, 'PowerFunction'))
+
     def evaluate(self, x: Numeric) -> Numeric:
         return self.val
 
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from math import isfinite
+from typing import Callable, Dict, List
+
+from custom_numbers.computation import DecimalNumber
+from custom_numbers.types import ComputationType
+from elementary_functions.calculus_utils import ConstantFunction
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.power import PowerFunction
+from elementary_functions.simple import CharacteristicFunction, \
+    SimpleFunction
+from elementary_functions.utils import CompositeFunction, FunctionProd, \
+    FunctionSum, function_of
+
+
+def compile_function(func) -> Callable[[ComputationType], ComputationType]:
+    """
+    Lowers a Function tree to a single generated function of x, with its
+    source on the source attribute
+    """
+    # Every node becomes one assignment of straight-line arithmetic. Shared
+    # powers are computed once and constants are folded, so the result only
+    # agrees with func.evaluate up to the rounding of the last digit.
+    tree = function_of(func)
+    if tree is None:
+        raise Exception(f'Only Function trees can be compiled, not {func}.')
+    emitter = _Emitter()
+    result = emitter.emit(tree, 'x')
+    emitter.lines.append(f'return {result}')
+    return emitter.build()
+
+
+def _square_root(x):
+    # A Decimal power goes through exp and ln, which is an order of magnitude
+    # slower than the correctly rounded Decimal.sqrt.
+    if isinstance(x, DecimalNumber) and x.inf_type == 0:
+        return DecimalNumber(x.d.sqrt())
+    return x ** 0.5
+
+
+def _reciprocal_square_root(x):
+    # At 0 the power is left to return infinity rather than divide by zero
+    if isinstance(x, DecimalNumber) and x.inf_type == 0 and x.d:
+        return DecimalNumber(1 / x.d.sqrt())
+    return x ** -0.5
+
+
+_ROOTS = {0.5: '_square_root', -0.5: '_reciprocal_square_root'}
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, Decimal)) \
+        and not isinstance(value, bool)
+
+
+class _Emitter:
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, object] = {}
+        self.names: Dict[tuple, str] = {}
+        self.count = 0
+
+    def build(self):
+        parameters = ', '.join(self.constants)
+        body = '\n'.join(f'        {line}' for line in self.lines)
+        source = f'def factory({parameters}):\n' \
+                 f'    def compiled(x):\n{body}\n' \
+                 f'    return compiled\n'
+        namespace = {
+            '_square_root': _square_root,
+            '_reciprocal_square_root': _reciprocal_square_root,
+        }
+        exec(compile(source, '<compiled function>', 'exec'), namespace)
+        # The constants become closure variables of the compiled function.
+        compiled = namespace['factory'](**self.constants)
+        compiled.source = source
+        return compiled
+
+    def constant(self, value) -> str:
+        if isinstance(value, int) and not isinstance(value, bool) \
+                or isinstance(value, float) and isfinite(value):
+            return f'({value!r})' if value < 0 else repr(value)
+        for name, existing in self.constants.items():
+            if existing is value:
+                return name
+        name = f'c{len(self.constants)}'
+        self.constants[name] = value
+        return name
+
+    def assign(self, key: tuple, expression: str) -> str:
+        # Equal subexpressions of the same variable are only computed once.
+        if key in self.names:
+            return self.names[key]
+        name = f'v{self.count}'
+        self.count += 1
+        self.names[key] = name
+        self.lines.append(f'{name} = {expression}')
+        return name
+
+    def emit(self, func, x: str) -> str:
+        if isinstance(func, PowerFunction):
+            return self.emit_power(func, x)
+        if isinstance(func, Polynomial):
+            return self.emit_polynomial(func, x)
+        if isinstance(func, ConstantFunction):
+            return self.constant(func.val)
+        if isinstance(func, SimpleFunction):
+            if len(func.constituents) == 0:
+                return self.assign(('zero', x), f'{x} - {x}')
+            return self.emit_sum(func.constituents, x)
+        if isinstance(func, FunctionSum):
+            return self.emit_sum(func.constituents, x)
+        if isinstance(func, FunctionProd):
+            return self.emit_prod(func.constituents, x)
+        if isinstance(func, CompositeFunction):
+            return self.emit(func.outer, self.emit(func.inner, x))
+        if isinstance(func, CharacteristicFunction):
+            domain = self.constant(func.domain)
+            coefficient = self.constant(func.coefficient)
+            return self.assign(
+                ('characteristic', id(func), x),
+                f'({x} / {x}) * {coefficient} if {domain}.contains({x}) '
+                f'else {x} - {x}'
+            )
+        # Anything else is called as it is.
+        evaluate = self.constant(func.evaluate)
+        return self.assign(('call', id(func), x), f'{evaluate}({x})')
+
+    def emit_power(self, func: PowerFunction, x: str) -> str:
+        coefficient = func.coefficient
+        if func.power == 0:
+            return self.assign(
+                ('of', x, repr(coefficient)),
+                f'{x}.of({self.constant(coefficient)})',
+            )
+        power = x
+        if _is_number(func.power) and func.power in _ROOTS:
+            power = self.assign(
+                ('power', x, repr(func.power)),
+                f'{_ROOTS[func.power]}({x})',
+            )
+        elif func.power != 1 or not _is_number(func.power):
+            power = self.assign(
+                ('power', x, repr(func.power)),
+                f'{x} ** {self.constant(func.power)}',
+            )
+        if _is_number(coefficient) and coefficient == 1:
+            return power
+        return self.assign(
+            ('scale', power, repr(coefficient)),
+            f'{power} * {self.constant(coefficient)}',
+        )
+
+    def emit_polynomial(self, func: Polynomial, x: str) -> str:
+        coefficients = list(func.coefficients)
+        while coefficients and coefficients[-1] == 0:
+            coefficients.pop()
+        if len(coefficients) < 2:
+            return self.emit_sum(func.constituents, x)
+        key = ('polynomial', id(func), x)
+        if key in self.names:
+            return self.names[key]
+        result = self.assign(
+            key + (len(coefficients) - 1,),
+            f'{x} * {self.constant(coefficients[-1])}',
+        )
+        for n in range(len(coefficients) - 2, -1, -1):
+            if coefficients[n] != 0:
+                result = self.assign(
+                    key + (n, '+'),
+                    f'{result} + {self.constant(coefficients[n])}',
+                )
+            if n > 0:
+                result = self.assign(key + (n, '*'), f'{result} * {x}')
+        self.names[key] = result
+        return result
+
+    def fold(self, constituents, combine, identity):
+        # Splits the constituents into the expressions that depend on x and
+        # the single constant that all of the others fold into.
+        folded = identity
+        variable = []
+        for func in constituents:
+            if isinstance(func, ConstantFunction) and _is_number(func.val):
+                folded = combine(folded, func.val)
+            else:
+                variable.append(func)
+        return variable, folded
+
+    def emit_sum(self, constituents, x: str) -> str:
+        variable, folded = self.fold(
+            constituents, lambda s, t: s + t, 0
+        )
+        terms = [self.emit(func, x) for func in variable]
+        if folded != 0 or len(terms) == 0:
+            terms.append(self.constant(folded))
+        if len(terms) == 1:
+            return terms[0]
+        return self.assign(('sum', *terms), ' + '.join(terms))
+
+    def emit_prod(self, constituents, x: str) -> str:
+        if len(constituents) == 0:
+            raise ArithmeticError
+        variable, folded = self.fold(
+            constituents, lambda s, t: s * t, 1
+        )
+        factors = [self.emit(func, x) for func in variable]
+        if folded != 1 or len(factors) == 0:
+            factors.append(self.constant(folded))
+        if len(factors) == 1:
+            return factors[0]
+        return self.assign(('prod', *factors), ' * '.join(factors))
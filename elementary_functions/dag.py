@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Tuple
+
+from custom_numbers.types import ComputationType
+from elementary_functions.calculus_utils import ConstantFunction, \
+    DifferentiableFunction
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.power import PowerFunction
+from elementary_functions.simple import CharacteristicFunction, \
+    SimpleFunction
+from elementary_functions.utils import CompositeFunction, FunctionProd, \
+    FunctionSum, function_of
+
+
+class Node:
+    """A vertex of a FunctionGraph, which never creates two equal ones"""
+
+    def __init__(self, graph: FunctionGraph, index: int, op: str,
+                 children: Tuple[Node, ...] = (), value=None):
+        self.graph = graph
+        self.index = index
+        # 'constant' and 'leaf' nodes hold a number or a Function as value.
+        # 'sum', 'prod' and 'compose' have children, the outer function first.
+        self.op = op
+        self.children = children
+        self.value = value
+
+    def __repr__(self):
+        if self.op in ('constant', 'leaf'):
+            return f'Node({self.index},{self.op},{self.value})'
+        return f'Node({self.index},{self.op},' \
+               f'{[child.index for child in self.children]})'
+
+    def evaluate(self, x: ComputationType) -> ComputationType:
+        return self.graph.evaluate_many([self], x)[0]
+
+    def differentiate(self) -> Node:
+        return self.graph.differentiate(self)
+
+
+class FunctionGraph:
+    """Function trees as a hash-consed DAG of shared subexpressions"""
+
+    def __init__(self):
+        self.nodes: Dict[Hashable, Node] = {}
+        # Memoized derivatives let the product and chain rules reuse nodes,
+        # so successive derivatives grow polynomially
+        self.derivatives: Dict[int, Node] = {}
+        self.zero = self.__intern(('constant', _number_key(0)), 'constant',
+                                  value=0)
+        self.one = self.__intern(('constant', _number_key(1)), 'constant',
+                                 value=1)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __intern(self, key, op, children=(), value=None) -> Node:
+        node = self.nodes.get(key)
+        if node is None:
+            node = Node(self, len(self.nodes), op, children, value)
+            self.nodes[key] = node
+        return node
+
+    def constant(self, value) -> Node:
+        return self.__intern(
+            ('constant', _number_key(value)), 'constant', value=value
+        )
+
+    def leaf(self, func) -> Node:
+        """Only leaves that can be described by their numbers are shared"""
+        if isinstance(func, PowerFunction):
+            if func.coefficient == 0:
+                return self.zero
+            if func.power == 0:
+                return self.constant(func.coefficient)
+            key = ('power', _number_key(func.power),
+                   _number_key(func.coefficient))
+        elif isinstance(func, Polynomial):
+            coefficients = list(func.coefficients)
+            while coefficients and coefficients[-1] == 0:
+                coefficients.pop()
+            if len(coefficients) == 0:
+                return self.zero
+            if len(coefficients) == 1:
+                return self.constant(coefficients[0])
+            key = ('polynomial', tuple(map(_number_key, coefficients)))
+        elif isinstance(func, ConstantFunction):
+            return self.constant(func.val)
+        else:
+            key = ('leaf', id(func))
+        return self.__intern(key, 'leaf', value=func)
+
+    def sum(self, *terms: Node) -> Node:
+        terms = sorted(
+            (term for term in terms if term is not self.zero),
+            key=lambda term: term.index,
+        )
+        if len(terms) == 0:
+            return self.zero
+        if len(terms) == 1:
+            return terms[0]
+        return self.__intern(
+            ('sum', tuple(term.index for term in terms)), 'sum', tuple(terms)
+        )
+
+    def prod(self, *factors: Node) -> Node:
+        coefficient = 1
+        others = []
+        for factor in factors:
+            if factor.op == 'constant':
+                coefficient = coefficient * factor.value
+            else:
+                others.append(factor)
+        if coefficient == 0:
+            return self.zero
+        if coefficient != 1:
+            others.append(self.constant(coefficient))
+        others.sort(key=lambda factor: factor.index)
+        if len(others) == 0:
+            return self.one
+        if len(others) == 1:
+            return others[0]
+        return self.__intern(
+            ('prod', tuple(factor.index for factor in others)), 'prod',
+            tuple(others),
+        )
+
+    def compose(self, outer: Node, inner: Node) -> Node:
+        if outer.op == 'constant':
+            return outer
+        return self.__intern(
+            ('compose', outer.index, inner.index), 'compose', (outer, inner)
+        )
+
+    def add(self, func) -> Node:
+        """
+        Returns the node of a Function tree, or of the bound evaluate method
+        of one.
+        """
+        tree = function_of(func)
+        if tree is None:
+            raise Exception(f'Only Function trees can be added, not {func}.')
+        if isinstance(tree, (PowerFunction, Polynomial, ConstantFunction)):
+            return self.leaf(tree)
+        if isinstance(tree, FunctionSum):
+            return self.sum(*map(self.add, tree.constituents))
+        if isinstance(tree, FunctionProd):
+            return self.prod(*map(self.add, tree.constituents))
+        if isinstance(tree, CompositeFunction):
+            return self.compose(self.add(tree.outer), self.add(tree.inner))
+        return self.leaf(tree)
+
+    def differentiate(self, node: Node) -> Node:
+        derivative = self.derivatives.get(node.index)
+        if derivative is None:
+            derivative = self.__differentiate(node)
+            self.derivatives[node.index] = derivative
+        return derivative
+
+    def __differentiate(self, node: Node) -> Node:
+        if node.op == 'constant':
+            return self.zero
+        if node.op == 'sum':
+            return self.sum(*map(self.differentiate, node.children))
+        if node.op == 'prod':
+            return self.sum(*(
+                self.prod(*(
+                    node.children[:n]
+                    + (self.differentiate(node.children[n]),)
+                    + node.children[n + 1:]
+                ))
+                for n in range(len(node.children))
+            ))
+        if node.op == 'compose':
+            outer, inner = node.children
+            return self.prod(
+                self.differentiate(inner),
+                self.compose(self.differentiate(outer), inner),
+            )
+        if isinstance(node.value, DifferentiableFunction):
+            return self.add(node.value.differentiate())
+        if isinstance(node.value, (CharacteristicFunction, SimpleFunction)):
+            return self.zero
+        raise NotImplementedError
+
+    def derivatives_of(self, node: Node, k: int) -> List[Node]:
+        """Returns node followed by its first k derivatives"""
+        result = [node]
+        for _ in range(k):
+            result.append(self.differentiate(result[-1]))
+        return result
+
+    def size(self, *nodes: Node) -> int:
+        """Counts the distinct nodes that nodes are built from"""
+        seen = set()
+        pending = list(nodes)
+        while pending:
+            node = pending.pop()
+            if node.index not in seen:
+                seen.add(node.index)
+                pending.extend(node.children)
+        return len(seen)
+
+    def evaluate_many(
+        self, nodes: List[Node], x: ComputationType
+    ) -> List[ComputationType]:
+        """
+        Evaluates every node at x, computing each node they share only once.
+        """
+        memos = {}
+        return [self.__evaluate(node, x, (), memos) for node in nodes]
+
+    def __evaluate(self, node: Node, x, argument: tuple, memos: dict):
+        # Values are remembered per node and per argument. The argument is
+        # identified by the chain of inner nodes it was computed from, x
+        # itself being the empty chain.
+        memo = memos.get(argument)
+        if memo is None:
+            memo = memos[argument] = {}
+        if node.index in memo:
+            return memo[node.index]
+        if node.op == 'constant':
+            value = node.value
+        elif node.op == 'leaf':
+            value = node.value.evaluate(x)
+        elif node.op == 'compose':
+            outer, inner = node.children
+            value = self.__evaluate(
+                outer, self.__evaluate(inner, x, argument, memos),
+                argument + (inner.index,), memos,
+            )
+        else:
+            value = None
+            for child in node.children:
+                child_value = self.__evaluate(child, x, argument, memos)
+                if value is None:
+                    value = child_value
+                elif node.op == 'sum':
+                    value = value + child_value
+                else:
+                    value = value * child_value
+        memo[node.index] = value
+        return value
+
+
+def _number_key(value) -> Hashable:
+    # 2 and 2.0 are equal but evaluate to different types, so they are
+    # different leaves.
+    return type(value).__name__, value
@@ -1,6 +1,6 @@
-from typing import List
+from typing import Iterable, List
 
-from custom_numbers.types import Numeric
+from custom_numbers.types import ComputationType, Numeric
 from custom_numbers.utils import maximum
 from elementary_functions.calculus_utils import ConstantFunction, \
     DifferentiableSum, DifferentiableFunction
@@ -9,23 +9,65 @@ from elementary_functions.utils import FunctionSum, CompositeFunction
 
 
 class Polynomial(DifferentiableSum):
-    constituents: List[PowerFunction]
-
     def __init__(self, *coefficients: Numeric):
+        # The PowerFunction constituents are only built once something asks
+        # for them. Evaluation works from the coefficients directly.
         self.coefficients = list(coefficients)
-        DifferentiableSum.__init__(self, *filter(
-            lambda x: x.coefficient != 0,
-            map(
-                lambda x: PowerFunction(x[0], x[1]),
-                enumerate(self.coefficients),
-            )
-        ))
+        self.__constituents = None
+
+    @property
+    def constituents(self) -> List[PowerFunction]:
+        if self.__constituents is None:
+            self.__constituents = list(filter(
+                lambda x: x.coefficient != 0,
+                map(
+                    lambda x: PowerFunction(x[0], x[1]),
+                    enumerate(self.coefficients),
+                )
+            ))
+        return self.__constituents
+
+    def __degree(self) -> int:
+        degree = len(self.coefficients) - 1
+        while degree >= 0 and self.coefficients[degree] == 0:
+            degree -= 1
+        return degree
+
+    def __horner(self, degree: int, x: ComputationType) -> ComputationType:
+        result = x * self.coefficients[degree]
+        for n in range(degree - 1, -1, -1):
+            if self.coefficients[n] != 0:
+                result = result + self.coefficients[n]
+            if n > 0:
+                result = result * x
+        return result
+
+    def evaluate(self, x: ComputationType) -> ComputationType:
+        """
+        Evaluates the polynomial in Horner form, which takes one
+        multiplication and at most one addition per coefficient.
+        """
+        degree = self.__degree()
+        if degree < 1:
+            return FunctionSum.evaluate(self, x)
+        return self.__horner(degree, x)
+
+    def evaluate_many(
+        self, xs: Iterable[ComputationType]
+    ) -> List[ComputationType]:
+        degree = self.__degree()
+        if degree < 1:
+            return [FunctionSum.evaluate(self, x) for x in xs]
+        return [self.__horner(degree, x) for x in xs]
 
     def __eq__(self, other):
         if isinstance(other, FunctionSum):
-            return set(self.constituents) == set(other.constituents)
+            return FunctionSum.__eq__(self, other)
         return len(self.constituents) == 1 and self.constituents[0] == other
 
+    def __hash__(self):
+        return FunctionSum.__hash__(self)
+
     def __req__(self, other):
         if isinstance(other, PowerFunction):
             return self == other
@@ -35,8 +77,9 @@ class Polynomial(DifferentiableSum):
         return f'Polynomial(coefficients={self.coefficients})'
 
     def __reduce(self):
-        while self.coefficients[-1] == 0:
+        while self.coefficients and self.coefficients[-1] == 0:
             self.coefficients.pop()
+        self.__constituents = None
         return Polynomial(*self.coefficients)
 
     def __rmul__(self, other):
@@ -26,9 +26,12 @@ class CharacteristicFunction:
                 and self.domain == Interval(-inf, inf):
             return self.coefficient == other.val
         return isinstance(other, CharacteristicFunction) \
-            and self.domain == other.domain
+            and self.domain == other.domain \
+            and self.coefficient == other.coefficient
 
     def __hash__(self):
+        if self.domain == Interval(-inf, inf):
+            return hash(ConstantFunction(self.coefficient))
         return hash((self.domain, self.coefficient, 'CharacteristicFunction'))
 
     def evaluate(self, x: ComputationType) -> ComputationType:
@@ -80,8 +83,10 @@ class SimpleFunction:
     def __eq__(self, other):
         if isinstance(other, CharacteristicFunction):
             return len(self.constituents) == 1 and self.constituents[0] == other
-        return isinstance(other, SimpleFunction) \
-            and set(self.constituents) == set(other.constituents)
+        return FunctionSum.__eq__(self, other)
+
+    def __hash__(self):
+        return FunctionSum.__hash__(self)
 
     def __mul__(self, other):
         raise NotImplementedError
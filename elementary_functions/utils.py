@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from collections import Counter
 from typing import Protocol, List, runtime_checkable, Union
 
 from custom_numbers.types import ComputationType
@@ -41,13 +42,24 @@ class FunctionSum:
         return f'FunctionSum({",".join(map(str, self.constituents))})'
 
     def __eq__(self, other):
+        # Sums are equal when they add up the same constituents, in any
+        # order. Anything else with constituents, such as a SimpleFunction,
+        # counts as a sum unless it is a product.
+        if len(self.constituents) == 1:
+            return self.constituents[0] == other
         if hasattr(other, 'constituents'):
-            return set(self.constituents) == set(other.constituents)
+            if len(other.constituents) == 1:
+                return self == other.constituents[0]
+            return not isinstance(other, FunctionProd) \
+                and Counter(self.constituents) == Counter(other.constituents)
         if len(self.constituents) == 0:
-            return other.__req__(self)
-        if len(self.constituents) > 1:
-            return False
-        return self.constituents[0] == other
+            if hasattr(other, '__req__'):
+                return other.__req__(self)
+            return NotImplemented
+        return False
+
+    def __hash__(self):
+        return _structural_hash(self.constituents, 'FunctionSum', 0)
 
     def evaluate(self, x: ComputationType) -> ComputationType:
         return sum(map(lambda f: f.evaluate(x), self.constituents))
@@ -84,13 +96,21 @@ class FunctionProd:
         return f'FunctionProd({",".join(map(str, self.constituents))})'
 
     def __eq__(self, other):
+        if len(self.constituents) == 1:
+            return self.constituents[0] == other
         if hasattr(other, 'constituents'):
-            return set(self.constituents) == set(other.constituents)
+            if len(other.constituents) == 1:
+                return self == other.constituents[0]
+            return isinstance(other, FunctionProd) \
+                and Counter(self.constituents) == Counter(other.constituents)
         if len(self.constituents) == 0:
-            return other.__req__(self)
-        if len(self.constituents) > 1:
-            return False
-        return self.constituents[0] == other
+            if hasattr(other, '__req__'):
+                return other.__req__(self)
+            return NotImplemented
+        return False
+
+    def __hash__(self):
+        return _structural_hash(self.constituents, 'FunctionProd', 1)
 
     def evaluate(self, x: ComputationType) -> ComputationType:
         result: Union[ComputationType, None] = None
@@ -130,6 +150,17 @@ class CompositeFunction:
         self.outer = outer
         self.inner = inner
 
+    def __eq__(self, other):
+        if isinstance(other, CompositeFunction):
+            return self.outer == other.outer and self.inner == other.inner
+        constituents = getattr(other, 'constituents', None)
+        if constituents is not None and len(constituents) == 1:
+            return constituents[0] == self
+        return False
+
+    def __hash__(self):
+        return hash((self.outer, self.inner, 'CompositeFunction'))
+
     def evaluate(self, x: ComputationType) -> ComputationType:
         return self.outer.evaluate(self.inner.evaluate(x))
 
@@ -144,3 +175,28 @@ class CompositeFunction:
 
     def __matmul__(self, other):
         return CompositeFunction(self, other)
+
+
+def _structural_hash(constituents: list, name: str, empty) -> int:
+    # Equal functions must hash alike. A sum or product of one function
+    # equals that function and an empty one equals the constant function of
+    # its identity, which hashes like the PowerFunction x^0.
+    if len(constituents) == 1:
+        return hash(constituents[0])
+    if len(constituents) == 0:
+        return hash((empty, 0, 'PowerFunction'))
+    return hash((frozenset(Counter(constituents).items()), name))
+
+
+def function_of(func) -> Union[Function, None]:
+    """
+    Returns the Function behind func when func is either a Function or the
+    bound evaluate method of one. Plain callables return None.
+    """
+    if isinstance(func, Function):
+        return func
+    owner = getattr(func, '__self__', None)
+    if getattr(func, '__name__', None) == 'evaluate' \
+            and isinstance(owner, Function):
+        return owner
+    return None
@@ -0,0 +1,257 @@
+"""
+Benchmarks for the integrators, compared against a stored baseline with:
+
+    python -m performance_tests.benchmarks --output results.json \
+        --baseline performance_tests/baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from advanced_functions.elliptic import EllipticFunction
+from calculus.integrator import Integrator, Mode
+from custom_numbers.computation import DecimalNumber
+from custom_numbers.exact.rational_number import RationalNumber
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.simple import CharacteristicFunction
+from general.interval import Interval
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# How much worse than the baseline each metric may get before it counts as
+# a regression. Times and memory are ratios, evaluations are a ratio and the
+# hit rate is an absolute drop.
+DEFAULT_THRESHOLDS = {
+    'wall_time': 1.5,
+    'evaluations': 1.0,
+    'peak_memory': 1.5,
+    'hit_rate': 0.05,
+}
+
+
+class Benchmark:
+    def __init__(
+        self, name: str,
+        integrator: Callable[[], Integrator],
+        run: Callable[[Integrator], object],
+    ):
+        self.name = name
+        self.integrator = integrator
+        self.run = run
+
+    def measure(self, repeat: int = 3) -> Dict[str, float]:
+        """Times the fastest of repeat runs"""
+        # The peak memory comes from one more run, because tracemalloc would
+        # slow down the timed ones
+        wall_time = None
+        integrator = None
+        for _ in range(repeat):
+            integrator = self.integrator()
+            integrator.cache.reset_stats()
+            start = time.perf_counter()
+            self.run(integrator)
+            duration = time.perf_counter() - start
+            if wall_time is None or duration < wall_time:
+                wall_time = duration
+
+        tracemalloc.start()
+        try:
+            self.run(self.integrator())
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            'wall_time': wall_time,
+            'evaluations': integrator.cache.misses,
+            'hit_rate': integrator.cache.hit_rate(),
+            'peak_memory': peak_memory,
+        }
+
+
+def _circle(x):
+    return 4 * (1 - x ** 2) ** Decimal('0.5') \
+        if not isinstance(x, float) else 4 * (1 - x ** 2) ** 0.5
+
+
+def _characteristic_function():
+    return CharacteristicFunction(Interval(-6, -2)) \
+        + CharacteristicFunction(Interval(-1, 1), 3) \
+        + CharacteristicFunction(Interval(3, 4, True, True), -2)
+
+
+_ELLIPTIC = EllipticFunction(2)
+
+
+def _benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for precision in (2, 3, 4):
+        benchmarks.append(Benchmark(
+            f'circle_pi_decimal_precision_{precision}',
+            lambda: Integrator(DecimalNumber.of(0), _circle, Mode.DECREASING),
+            lambda i, p=precision: i.integral_to_precision(0, 1, p, 2),
+        ))
+    benchmarks.append(Benchmark(
+        'circle_pi_float_precision_4',
+        lambda: Integrator(0.0, _circle, Mode.DECREASING),
+        lambda i: i.integral_to_precision(0, 1, 4, 2),
+    ))
+    for precision in (2, 3):
+        benchmarks.append(Benchmark(
+            f'elliptic_decimal_precision_{precision}',
+            lambda: Integrator(
+                DecimalNumber.of(0), _ELLIPTIC.evaluate, Mode.DECREASING
+            ),
+            lambda i, p=precision: i.integral_to_precision(
+                0, 1, p, 2, error_func_upper=_ELLIPTIC.error_function
+            ),
+        ))
+    benchmarks.append(Benchmark(
+        'elliptic_tanh_sinh_decimal_precision_20',
+        lambda: Integrator(DecimalNumber.of(0), _ELLIPTIC.evaluate),
+        lambda i: i.integral_tanh_sinh(0, 1, 20),
+    ))
+    polynomial = Polynomial(-4, -1, 3, 0, 1)
+    for name, zero_val in (
+        ('decimal', DecimalNumber.of(0)),
+        ('rational', RationalNumber(0)),
+        ('float', 0.0),
+    ):
+        benchmarks.append(Benchmark(
+            f'polynomial_{name}_panels_20',
+            lambda z=zero_val: Integrator(z, polynomial.evaluate),
+            lambda i: i.integrate(-1, 2, 20),
+        ))
+    benchmarks.append(Benchmark(
+        'polynomial_decimal_monotone_pieces_panels_20',
+        lambda: Integrator(
+            DecimalNumber.of(0), polynomial.evaluate, Mode.MONOTONE_PIECES
+        ),
+        lambda i: i.integrate(-1, 2, 20),
+    ))
+    benchmarks.append(Benchmark(
+        'polynomial_decimal_romberg_precision_20',
+        lambda: Integrator(DecimalNumber.of(0), polynomial.evaluate),
+        lambda i: i.integrate_romberg(-1, 2, 20),
+    ))
+    for name, zero_val in (
+        ('decimal', DecimalNumber.of(0)), ('float', 0.0),
+    ):
+        benchmarks.append(Benchmark(
+            f'characteristic_{name}_panels_20',
+            lambda z=zero_val: Integrator(
+                z, _characteristic_function().evaluate
+            ),
+            lambda i: i.integrate(-7, 5, 20),
+        ))
+    return benchmarks
+
+
+BENCHMARKS = _benchmarks()
+
+
+def run(
+    benchmarks: List[Benchmark] = None, repeat: int = 3
+) -> Dict[str, Dict[str, float]]:
+    if benchmarks is None:
+        benchmarks = BENCHMARKS
+    return {
+        benchmark.name: benchmark.measure(repeat)
+        for benchmark in benchmarks
+    }
+
+
+def write_json(results: Dict[str, Dict[str, float]], path: str):
+    with open(path, 'w') as file:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'benchmarks': results,
+        }, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def read_json(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path) as file:
+        return json.load(file)['benchmarks']
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    thresholds: Dict[str, float] = None,
+) -> List[str]:
+    """
+    Returns a description of every metric that regressed beyond its
+    threshold, skipping metrics whose threshold is None
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    if thresholds is not None:
+        limits.update(thresholds)
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        if name not in baseline:
+            continue
+        for metric, limit in limits.items():
+            if limit is None:
+                continue
+            current = metrics[metric]
+            previous = baseline[name][metric]
+            if metric == 'hit_rate':
+                regressed = current < previous - limit
+            else:
+                regressed = current > previous * limit
+            if regressed:
+                regressions.append(
+                    f'{name}: {metric} went from {previous} to {current}, '
+                    f'beyond the threshold of {limit}.'
+                )
+    return regressions
+
+
+def main(arguments: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--output', help='where to write the results')
+    parser.add_argument('--baseline', help='the results to compare against')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--filter', default='', help='only run benchmarks whose name has this'
+    )
+    for metric, limit in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(
+            f'--{metric.replace("_", "-")}-threshold',
+            dest=metric, type=float, default=limit,
+        )
+    options = parser.parse_args(arguments)
+
+    results = run(
+        [b for b in BENCHMARKS if options.filter in b.name], options.repeat
+    )
+    for name, metrics in results.items():
+        print(f'{name}: {metrics["wall_time"] * 1000:.1f}ms, '
+              f'{metrics["evaluations"]} evaluations, '
+              f'{metrics["hit_rate"]:.0%} cache hits, '
+              f'{metrics["peak_memory"] / 1024:.0f}KiB peak')
+    if options.output:
+        write_json(results, options.output)
+    if options.baseline:
+        regressions = compare(
+            results, read_json(options.baseline),
+            {metric: getattr(options, metric)
+             for metric in DEFAULT_THRESHOLDS},
+        )
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Times the DecimalNumber operations that dominate the integrators, one
+operation at a time, and a whole integration made of them:
+
+    python -m performance_tests.decimal_number_benchmark
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from decimal import Decimal
+from typing import Dict
+
+from calculus.integrator import Integrator, Mode
+from custom_numbers.computation import DecimalNumber
+
+_X = DecimalNumber(Decimal('0.7071067811865475244008443621'))
+_Y = DecimalNumber(Decimal('1.414213562373095048801688724'))
+
+OPERATIONS = {
+    'add': lambda: _X + _Y,
+    'add_int': lambda: _X + 1,
+    'radd_int': lambda: 1 + _X,
+    'sub': lambda: _X - _Y,
+    'rsub_int': lambda: 1 - _X,
+    'mul': lambda: _X * _Y,
+    'mul_int': lambda: _X * 4,
+    'truediv': lambda: _X / _Y,
+    'truediv_int': lambda: _X / 2,
+    'pow_int': lambda: _X ** 2,
+    'neg': lambda: -_X,
+    'abs': lambda: abs(_X),
+    'lt': lambda: _X < _Y,
+    'le': lambda: _X <= _Y,
+    'gt': lambda: _X > _Y,
+    'eq_int': lambda: _X == 1,
+    'min': lambda: min(_X, _Y),
+    'of_int': lambda: DecimalNumber.of(0),
+}
+
+
+def _circle_pi():
+    Integrator(
+        DecimalNumber.of(0), lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+        Mode.DECREASING,
+    ).integral_to_precision(0, 1, 3, 2)
+
+
+def measure(number: int = 100000, repeat: int = 5) -> Dict[str, float]:
+    """Returns the best time per call of every operation in nanoseconds"""
+    results = {}
+    for name, operation in OPERATIONS.items():
+        best = min(timeit.repeat(operation, number=number, repeat=repeat))
+        results[name] = best / number * 1e9
+    best = min(timeit.repeat(_circle_pi, number=1, repeat=repeat))
+    results['integral_to_precision_circle_3'] = best * 1e9
+    return results
+
+
+def main() -> int:
+    for name, nanoseconds in measure().items():
+        if nanoseconds >= 1e6:
+            print(f'{name}: {nanoseconds / 1e6:.1f}ms')
+        else:
+            print(f'{name}: {nanoseconds:.0f}ns')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
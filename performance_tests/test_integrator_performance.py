@@ -4,12 +4,17 @@ from math import pi
 from unittest import TestCase
 
 from calculus.integrator import Integrator, Mode
+from custom_numbers.computation import DecimalNumber
+from performance_tests.benchmarks import BASELINE, compare, read_json, run
 
 
 class TestIntegratorPerformance(TestCase):
     def test_calculate_circle_area_to_precision_timing(self):
-        integrator = Integrator(lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
-                                Mode.DECREASING)
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+            Mode.DECREASING,
+        )
         duration = 0
         precision = 0
         while duration < 1000 and precision <= 8:
@@ -45,6 +50,7 @@ class TestIntegratorPerformance(TestCase):
 
         def get_elliptic_integrator(a):
             return Integrator(
+                DecimalNumber.of(0),
                 lambda x: elliptic_function(a, x),
                 Mode.DECREASING
             )
@@ -55,3 +61,12 @@ class TestIntegratorPerformance(TestCase):
         )[0] == Decimal('4.844')
         # The true value of 2 * 2 * EllipticE(1 - 1 / 2^2) is
         # 4.8442241102738380992142515981959147059769591989433004125415581762
+
+    def test_benchmarks_against_baseline(self):
+        # Wall time and memory depend on the machine, so they are left to
+        # the benchmarks command. Evaluation counts and hit rates do not.
+        regressions = compare(
+            run(repeat=1), read_json(BASELINE),
+            {'wall_time': None, 'peak_memory': None},
+        )
+        assert regressions == [], '\n'.join(regressions)
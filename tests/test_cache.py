@@ -0,0 +1,122 @@
+from decimal import Decimal
+
+from calculus.cache import LRUCache, UnboundedCache
+from calculus.integrator import Integrator, Mode
+from custom_numbers.computation import DecimalNumber
+from elementary_functions.polynomial import Polynomial
+
+
+def test_unbounded_cache_statistics():
+    evaluations = []
+
+    def func(x):
+        evaluations.append(x)
+        return x * x
+
+    cache = UnboundedCache()
+    key = cache.function_key(func)
+    assert [cache.get(key, func, x) for x in [1, 2, 1, 3, 2]] \
+        == [1, 4, 1, 9, 4]
+    assert evaluations == [1, 2, 3]
+    assert cache.hits == 2
+    assert cache.misses == 3
+    assert cache.hit_rate() == 0.4
+
+
+def test_get_many_evaluates_missing_values_together():
+    batches = []
+
+    def batch(xs):
+        batches.append(xs)
+        return [x * x for x in xs]
+
+    cache = UnboundedCache()
+    key = cache.function_key(batch)
+    cache.get(key, lambda x: x * x, 2)
+    assert cache.get_many(key, batch, [1, 2, 3, 1]) == [1, 4, 9, 1]
+    assert batches == [[1, 3]]
+    assert cache.misses == 3
+    assert cache.get_many(key, batch, [3, 2]) == [9, 4]
+    assert len(batches) == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    key = cache.function_key(abs)
+    cache.get(key, abs, -1)
+    cache.get(key, abs, -2)
+    cache.get(key, abs, -1)
+    cache.get(key, abs, -3)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    cache.get(key, abs, -1)
+    assert cache.hits == 2
+    cache.get(key, abs, -2)
+    assert cache.misses == 4
+
+
+def test_cache_distinguishes_functions():
+    cache = UnboundedCache()
+    first = Polynomial(0, 1).evaluate
+    second = Polynomial(0, 2).evaluate
+    first_key = cache.function_key(first)
+    second_key = cache.function_key(second)
+    assert cache.get(first_key, first, 3) == 3
+    assert cache.get(second_key, second, 3) == 6
+    assert cache.misses == 2
+
+
+def test_integrator_clears_cache_between_calls_by_default():
+    cache = UnboundedCache()
+    integrator = Integrator(
+        DecimalNumber.of(0), lambda x: 3 * x ** 2, cache=cache
+    )
+    integrator.integrate(-1, 1, 4)
+    assert len(cache) == 0
+    integrator.integrate(-1, 1, 4)
+    assert cache.misses == 2 * (4 * 100 + 1)
+
+
+def test_integrator_persistent_cache_reuses_values():
+    cache = LRUCache(10000)
+    integrator = Integrator(
+        DecimalNumber.of(0),
+        lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+        Mode.DECREASING,
+        cache=cache,
+        persistent_cache=True,
+    )
+    integrator.integral_to_precision(0, 1, 2, 2)
+    misses = cache.misses
+    assert integrator.integral_to_precision(0, 1, 2, 2)[0] == Decimal('3.14')
+    assert cache.misses == misses
+    assert integrator.integral_to_precision(0, 1, 3, 2)[0] == Decimal('3.142')
+    assert cache.hits > misses
+
+
+def test_persistent_cache_does_not_reuse_less_precise_values():
+    integrator = Integrator(
+        DecimalNumber.of(0), lambda x: 4 / (1 + x ** 2), Mode.DECREASING,
+        cache=LRUCache(10000), persistent_cache=True,
+    )
+    integrator.integral_to_precision(0, 1, 2, 2)
+    result = integrator.integrate_romberg(0, 1, 30)
+    pi = Decimal('3.14159265358979323846264338327950288')
+    assert abs(result.trap - pi) < Decimal('1E-30')
+
+
+def test_persistent_cache_reuses_more_precise_values():
+    for zero_val, func in (
+        (0.0, lambda x: 4 * (1 - x ** 2) ** 0.5),
+        (DecimalNumber.of(0),
+         lambda x: 4 * (1 - x ** 2) ** Decimal('0.5')),
+    ):
+        cache = LRUCache(10000)
+        integrator = Integrator(
+            zero_val, func, Mode.DECREASING,
+            cache=cache, persistent_cache=True,
+        )
+        integrator.integral_to_precision(0, 1, 3, 2)
+        misses = cache.misses
+        integrator.integral_to_precision(0, 1, 2, 2)
+        assert cache.misses == misses
@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+import pytest
+
+from advanced_functions.circle import Circle
+from advanced_functions.elliptic import EllipticFunction
+from calculus.integrator import Integrator, Mode
+from custom_numbers.computation import DecimalNumber
+from custom_numbers.exact.factory import to_exact
+from elementary_functions.calculus_utils import ConstantFunction
+from elementary_functions.compiler import compile_function
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.power import PowerFunction
+from elementary_functions.simple import CharacteristicFunction, \
+    SimpleFunction
+from elementary_functions.utils import FunctionProd, FunctionSum
+from general.interval import Interval
+
+
+def test_compile_polynomial():
+    func = Polynomial(1, 2, 3)
+    compiled = compile_function(func)
+    for n in range(-10, 11):
+        x = DecimalNumber.of(n) / 4
+        assert compiled(x) == func.evaluate(x)
+    assert compiled(to_exact(3) / 2) == func.evaluate(to_exact(3) / 2)
+
+
+def test_compile_circle():
+    circle = Circle(1, 2, 3)
+    compiled = compile_function(circle.func)
+    for n in range(-6, 13):
+        x = DecimalNumber.of(n) / 3
+        assert compiled(x) == circle.func.evaluate(x)
+
+
+def test_compile_reciprocal_square_root_at_zero():
+    func = PowerFunction(-0.5, 3)
+    zero = DecimalNumber.of(0)
+    assert compile_function(func)(zero) == func.evaluate(zero)
+    assert compile_function(func)(zero).to_decimal().is_infinite()
+
+
+def test_compile_bound_evaluate():
+    elliptic_function = EllipticFunction(2)
+    compiled = compile_function(elliptic_function.func.evaluate)
+    for n in range(10):
+        x = DecimalNumber.of(n) / 10
+        assert round(compiled(x), 25) \
+            == round(elliptic_function.func.evaluate(x), 25)
+
+
+def test_compile_folds_constants():
+    func = FunctionSum(
+        ConstantFunction(2), PowerFunction(3), ConstantFunction(5)
+    )
+    compiled = compile_function(func)
+    assert compiled(2.0) == 15.0
+    assert compiled.source.count('+') == 1
+
+    prod = FunctionProd(
+        ConstantFunction(2), PowerFunction(1), ConstantFunction(3)
+    )
+    assert compile_function(prod)(1.5) == 9.0
+    assert compile_function(FunctionSum(ConstantFunction(4)))(1.5) == 4
+
+
+def test_compile_shares_powers():
+    compiled = compile_function(
+        FunctionSum(
+            PowerFunction(2, 3), PowerFunction(2, -1) @ Polynomial(0, 1)
+        )
+    )
+    assert compiled(3.0) == 18.0
+
+
+def test_compile_simple_function():
+    func = SimpleFunction(
+        CharacteristicFunction(Interval(0, 1, True, False), 3),
+        CharacteristicFunction(Interval(1, 2, True, True), -1),
+    )
+    compiled = compile_function(func)
+    for x in [-0.5, 0.5, 1.0, 1.5, 2.0, 2.5]:
+        assert compiled(x) == func.evaluate(x)
+
+
+def test_compile_requires_function():
+    with pytest.raises(Exception):
+        compile_function(lambda x: x)
+    with pytest.raises(ArithmeticError):
+        compile_function(FunctionProd())
+
+
+def test_compiled_integrand():
+    circle = Circle(0, 0, 2)
+    compiled = Integrator(
+        DecimalNumber.of(0), compile_function(circle.func), Mode.DECREASING
+    ).integrate(0, 2, 10)
+    tree = Integrator(
+        DecimalNumber.of(0), circle.func.evaluate, Mode.DECREASING
+    ).integrate(0, 2, 10)
+    assert compiled.trap == tree.trap
+    assert compiled.min == tree.min
+    assert compiled.max == tree.max
+    assert round(compiled.trap, 1) == Decimal('3.1')
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from advanced_functions.elliptic import EllipticFunction
+from calculus.differentiator import differentiate
+from custom_numbers.computation import DecimalNumber
+from elementary_functions.dag import FunctionGraph
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.power import PowerFunction
+
+
+class CountedPolynomial(Polynomial):
+    evaluations = 0
+
+    def evaluate(self, x):
+        CountedPolynomial.evaluations += 1
+        return Polynomial.evaluate(self, x)
+
+
+def test_identical_subtrees_are_shared():
+    graph = FunctionGraph()
+    first = graph.add(
+        PowerFunction(0.5) @ Polynomial(1, 0, -1) * PowerFunction(2)
+    )
+    second = graph.add(
+        PowerFunction(2) * (PowerFunction(0.5) @ Polynomial(1, 0, -1))
+    )
+    assert first is second
+    assert graph.add(Polynomial(3, 0, 0)) is graph.constant(3)
+    assert graph.add(PowerFunction(2)) is not graph.add(PowerFunction(2.0))
+
+
+def test_simplification():
+    graph = FunctionGraph()
+    x = graph.add(PowerFunction(1))
+    assert graph.sum(x, graph.zero) is x
+    assert graph.prod(x, graph.one) is x
+    assert graph.prod(x, graph.zero) is graph.zero
+    assert graph.prod(graph.constant(2), x, graph.constant(3)) \
+        is graph.prod(x, graph.constant(6))
+    assert graph.differentiate(graph.differentiate(x)) is graph.zero
+
+
+def test_derivatives_match_the_tree():
+    func = EllipticFunction(2).func
+    graph = FunctionGraph()
+    nodes = graph.derivatives_of(graph.add(func), 4)
+    x = DecimalNumber.of(Decimal('0.5'))
+    values = graph.evaluate_many(nodes, x)
+    tree = func
+    for value in values:
+        assert abs(value - tree.evaluate(x)) < Decimal('1E-24')
+        tree = differentiate(tree)
+
+
+def test_derivatives_stay_small():
+    graph = FunctionGraph()
+    nodes = graph.derivatives_of(graph.add(EllipticFunction(2).func), 8)
+    sizes = [graph.size(node) for node in nodes]
+    assert sizes[-1] < 500
+    # All of the derivatives together share most of their nodes
+    assert graph.size(*nodes) < sum(sizes) / 2
+
+
+def test_shared_nodes_are_evaluated_once():
+    inner = CountedPolynomial(1, 0, -1)
+    graph = FunctionGraph()
+    nodes = graph.derivatives_of(
+        graph.add((PowerFunction(0.5) @ inner) * (PowerFunction(-1) @ inner)),
+        3,
+    )
+    CountedPolynomial.evaluations = 0
+    values = graph.evaluate_many(nodes, DecimalNumber.of(Decimal('0.5')))
+    assert CountedPolynomial.evaluations == 1
+    assert values[0] == nodes[0].evaluate(DecimalNumber.of(Decimal('0.5')))
@@ -1,9 +1,17 @@
-from calculus.differentiator import differentiate
+from decimal import Decimal
+
+from advanced_functions.circle import Circle
+from advanced_functions.elliptic import EllipticFunction
+from calculus.differentiator import critical_points, derivative_at, \
+    derivatives_at, differentiate
+from custom_numbers.computation import DecimalNumber
 from custom_numbers.exact.rational_number import RationalNumber
 from elementary_functions.polynomial import Polynomial
 from elementary_functions.power import PowerFunction
 from elementary_functions.simple import CharacteristicFunction, SimpleFunction
 from elementary_functions.calculus_utils import ConstantFunction
+from elementary_functions.utils import CompositeFunction, FunctionProd, \
+    FunctionSum
 from general.interval import Interval
 
 
@@ -34,3 +42,85 @@ def test_differentiate_simple_function():
         CharacteristicFunction(Interval(97, 114), -1),
     )) == ConstantFunction()
 
+
+def test_differentiate_composite():
+    derivative = differentiate(Circle(0, 0, 2).func)
+    x = DecimalNumber.of(1)
+    # d/dx (4 - x^2)^(1/2) = -x (4 - x^2)^(-1/2)
+    assert round(derivative.evaluate(x), 20) \
+        == round(-1 / DecimalNumber.of(3) ** 0.5, 20)
+
+
+def test_differentiate_product():
+    derivative = differentiate(FunctionSum(
+        FunctionProd(Polynomial(1, 1), PowerFunction(2)),
+        CompositeFunction(Polynomial(0, 0, 1), PowerFunction(1, 3)),
+    ))
+    assert derivative.evaluate(RationalNumber(2)) == 16 + 36
+
+
+def test_critical_points():
+    # f(x) = x^3 - 3x^2 has a maximum at 0 and a minimum at 2
+    derivative = differentiate(Polynomial(0, 0, -3, 1))
+    assert critical_points(
+        derivative, RationalNumber(-1), RationalNumber(3), 4
+    ) == [0, 2]
+    points = critical_points(
+        derivative, DecimalNumber.of(-1), DecimalNumber.of(3), 7
+    )
+    assert len(points) == 2
+    assert abs(points[0]) < Decimal('1E-25')
+    assert abs(points[1] - 2) < Decimal('1E-25')
+
+
+def test_derivative_at():
+    assert derivative_at(
+        lambda x: 3 * x ** 4 - x + 2, RationalNumber(2)
+    ) == 95
+    circle = Circle(0, 0, 2)
+    x = DecimalNumber.of(1)
+    assert abs(
+        derivative_at(circle.func, x)
+        - differentiate(circle.func).evaluate(x)
+    ) < Decimal('1E-25')
+    assert derivative_at(lambda x: 5, RationalNumber(1)) == 0
+
+
+def test_derivatives_at():
+    assert derivatives_at(
+        lambda x: 3 * x ** 4 - x + 2, RationalNumber(2), 5
+    ) == [48, 95, 144, 144, 72, 0]
+    elliptic_function = EllipticFunction(2)
+    x = DecimalNumber.of(Decimal('0.5'))
+    tree = elliptic_function.func
+    for value in derivatives_at(elliptic_function.func, x, 4):
+        assert abs(value - tree.evaluate(x)) < Decimal('1E-24')
+        tree = differentiate(tree)
+    assert derivatives_at(lambda x: 5, x, 2) == [5, 0, 0]
+
+
+def test_critical_points_of_a_callable():
+    assert critical_points(
+        lambda x: derivative_at(lambda y: y ** 3 - 3 * y ** 2, x),
+        RationalNumber(-1), RationalNumber(3), 4,
+    ) == [0, 2]
+
+
+def test_differentiate_is_memoized():
+    func = 2 * (PowerFunction(0.5) @ Polynomial(4, 0, -3)) \
+        * (PowerFunction(-0.5) @ Polynomial(1, 0, -1))
+    same = 2 * (PowerFunction(0.5) @ Polynomial(4, 0, -3)) \
+        * (PowerFunction(-0.5) @ Polynomial(1, 0, -1))
+    assert differentiate(func) is differentiate(same)
+    assert differentiate(differentiate(func)) \
+        is differentiate(differentiate(same))
+
+
+def test_memoized_derivatives_keep_coefficient_types():
+    assert differentiate(Polynomial(0, 0, 0.5)).coefficients == [0, 1]
+    derivative = differentiate(Polynomial(0, 0, Decimal('0.5')))
+    assert derivative.evaluate(Decimal('0.1')) == Decimal('0.1')
+    assert isinstance(
+        differentiate(Polynomial(0, 0, RationalNumber(1, 2))).coefficients[1],
+        RationalNumber,
+    )
@@ -0,0 +1,87 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from advanced_functions.circle import Circle
+from advanced_functions.elliptic import EllipticFunction
+from calculus.enclosure import enclose
+from calculus.integrator import Integrator, Mode
+from custom_numbers.computation import DecimalNumber
+from custom_numbers.exact.rational_number import RationalNumber
+from elementary_functions.polynomial import Polynomial
+from elementary_functions.power import PowerFunction
+from elementary_functions.simple import CharacteristicFunction
+from general.interval import Interval
+
+
+def assert_encloses(func, lower, upper, samples=50):
+    low, high = enclose(func, lower, upper)
+    for n in range(samples + 1):
+        y = func.evaluate(lower + (upper - lower) * n / samples)
+        assert low <= y <= high
+
+
+def test_enclose_powers():
+    assert enclose(PowerFunction(2), RationalNumber(-1), RationalNumber(2)) \
+        == (0, 4)
+    assert enclose(PowerFunction(3, -2), RationalNumber(-1), 2) == (-16, 2)
+    low, high = enclose(PowerFunction(-1), RationalNumber(-2), -1)
+    assert low <= -1 and RationalNumber(-1, 2) <= high < 0
+    with pytest.raises(ArithmeticError):
+        enclose(PowerFunction(-2), RationalNumber(-1), RationalNumber(1))
+    with pytest.raises(ArithmeticError):
+        enclose(PowerFunction(0.5), DecimalNumber.of(-2), DecimalNumber.of(-1))
+    with pytest.raises(ArithmeticError):
+        enclose(PowerFunction(-0.5), DecimalNumber.of(0), DecimalNumber.of(1))
+
+
+def test_enclose_monotone_polynomial_is_tight():
+    assert enclose(
+        Polynomial(0, 0, -3, 1), RationalNumber(3), RationalNumber(4)
+    ) == (0, 16)
+
+
+def test_enclose_contains_samples():
+    elliptic_function = EllipticFunction(2)
+    for func, lower, upper in [
+        (Polynomial(0, 0, -3, 1), -1, 3),
+        (Circle(1, 2, 3).func, -1, 4),
+        (elliptic_function.func, Decimal('0.1'), Decimal('0.99')),
+    ]:
+        assert_encloses(
+            func, DecimalNumber.of(lower), DecimalNumber.of(upper)
+        )
+    assert_encloses(Polynomial(0, 0, -3, 1), -1.0, 3.0)
+
+
+def test_enclose_is_widened_for_rounding():
+    three = DecimalNumber.of(3)
+    low, high = enclose(PowerFunction(-1), three, three)
+    assert Fraction(low.to_decimal()) < Fraction(1, 3) \
+        < Fraction(high.to_decimal())
+
+
+def test_enclose_characteristic():
+    func = CharacteristicFunction(Interval(0, 1, True, False), 5)
+    assert enclose(func, RationalNumber(0), RationalNumber(1, 2)) == (5, 5)
+    assert enclose(func, RationalNumber(2), RationalNumber(3)) == (0, 0)
+    assert enclose(func, RationalNumber(1, 2), RationalNumber(1)) == (0, 5)
+
+
+def test_integrate_enclosure():
+    circle = Circle(0, 0, 2)
+    result = Integrator(
+        DecimalNumber.of(0), circle.func.evaluate, Mode.ENCLOSURE
+    ).integrate(-2, 2, 20)
+    assert result.min <= Decimal('6.2831853') <= result.max
+    assert result.max - result.min < 2
+
+
+def test_integral_to_precision_enclosure():
+    integrator = Integrator(
+        DecimalNumber.of(0), Polynomial(0, 0, -3, 1).evaluate, Mode.ENCLOSURE
+    )
+    value, error = integrator.integral_to_precision(-1, 3, 2)
+    assert value == -8
+    assert error < Decimal('0.005')
@@ -1,14 +1,21 @@
-from decimal import Decimal
-from unittest import TestCase
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from decimal import Decimal, localcontext
+from unittest import TestCase, skipIf
 
 from advanced_functions.circle import Circle
+from algebra.linear.utils import TimingContext
 from advanced_functions.elliptic import EllipticFunction
-from calculus.integrator import Integrator, Mode, integrate_exact
+from calculus.integrator import Integrator, Mode, integrate_exact, Backend
+from calculus.vectorized import numpy_available
+from elementary_functions.calculus_utils import DifferentiableFunction
 from elementary_functions.polynomial import Polynomial
 from elementary_functions.power import PowerFunction
 from elementary_functions.simple import CharacteristicFunction, \
     SimpleFunction, Interval
 from custom_numbers.computation import DecimalNumber
+from custom_numbers.exact.rational_number import RationalNumber
 
 
 class TestIntegrator(TestCase):
@@ -82,6 +89,76 @@ class TestIntegrator(TestCase):
         assert messy_result.trap == Decimal('2.16')
         assert messy_result.min == Decimal('0.96')
 
+    def test_integrate_parabola_shared_grid(self):
+        evaluations = []
+
+        def func(x):
+            evaluations.append(x)
+            return 3 * x ** 2
+
+        integrator = Integrator(DecimalNumber.of(0), func, Mode.SHARED_GRID)
+        result = integrator.integrate(-1, 1, 4)
+        assert result.trap == Decimal('2.25')
+        assert result.min == Decimal('0.75')
+        assert result.max == Decimal('3.75')
+        assert len(evaluations) == 101
+
+        evaluations.clear()
+        fine_result = integrator.integrate(-1, 1, 100)
+        assert fine_result.trap == Decimal('2.0004')
+        assert fine_result.min == Decimal('1.9404')
+        assert fine_result.max == Decimal('2.0604')
+        assert len(evaluations) == 101
+
+    def test_integrate_monotone_pieces(self):
+        # f(x) = x^3 - 3x^2 turns at 0 and 2, inside the first and last panel
+        func = Polynomial(0, 0, -3, 1)
+        evaluations = []
+
+        class Counted(Polynomial):
+            def evaluate(self, x):
+                evaluations.append(x)
+                return Polynomial.evaluate(self, x)
+
+        pieces = Integrator(
+            RationalNumber(0), Counted(*func.coefficients).evaluate,
+            Mode.MONOTONE_PIECES,
+        ).integrate(-1, 3, 3)
+        sampled = Integrator(RationalNumber(0), func.evaluate)\
+            .integrate(-1, 3, 3)
+        assert len(evaluations) == 6
+        assert pieces.trap == sampled.trap
+        assert pieces.min == sampled.min
+        assert pieces.max == sampled.max
+        assert pieces.min <= -8 <= pieces.max
+
+    def test_integrate_monotone_pieces_composite(self):
+        circle = Circle(0, 0, 2)
+        pieces = Integrator(
+            DecimalNumber.of(0), circle.func.evaluate, Mode.MONOTONE_PIECES
+        ).integrate(-2, 2, 7)
+        sampled = Integrator(DecimalNumber.of(0), circle.func.evaluate)\
+            .integrate(-2, 2, 7, 1000)
+        assert pieces.min <= sampled.min
+        assert pieces.max >= sampled.max
+        assert pieces.max - sampled.max < Decimal('1E-20')
+
+    def test_integrate_monotone_pieces_callable(self):
+        pieces = Integrator(
+            RationalNumber(0), lambda x: x ** 3 - 3 * x ** 2,
+            Mode.MONOTONE_PIECES,
+        ).integrate(-1, 3, 3)
+        sampled = Integrator(
+            RationalNumber(0), Polynomial(0, 0, -3, 1).evaluate
+        ).integrate(-1, 3, 3)
+        assert pieces.min == sampled.min
+        assert pieces.max == sampled.max
+
+    def test_integrate_monotone_pieces_requires_dual_numbers(self):
+        with self.assertRaises(Exception):
+            Integrator(0.0, lambda x: math.sqrt(x), Mode.MONOTONE_PIECES)\
+                .integrate(0, 1, 2)
+
     def test_calculate_circle_area(self):
         circle = Circle(0, 0, 2)
         integrator = Integrator(DecimalNumber.of(0), circle.evaluate, Mode.DECREASING)
@@ -120,3 +197,437 @@ class TestIntegrator(TestCase):
         )[0] == Decimal('4.8')
         # The true value of 2 * 2 * EllipticE(1 - 1 / 2^2) is
         # 4.8442241102738380992142515981959147059769591989433004125415581762
+
+    def test_elliptic_error_function_trims_at_higher_precisions(self):
+        elliptic_function = EllipticFunction(2)
+        integrator = Integrator(
+            DecimalNumber.of(0), elliptic_function.evaluate, Mode.DECREASING
+        )
+        for precision, expected in ((5, '4.84422'), (6, '4.844224')):
+            assert integrator.integral_to_precision(
+                0, 1, precision=precision, resolution=2,
+                error_func_upper=elliptic_function.error_function
+            )[0] == Decimal(expected)
+
+    def test_integral_to_precision_refines_largest_error_first(self):
+        elliptic_function = EllipticFunction(2)
+        evaluations = []
+
+        def func(x):
+            evaluations.append(x)
+            return elliptic_function.evaluate(x)
+
+        value, error = Integrator(
+            DecimalNumber.of(0), func, Mode.DECREASING
+        ).integral_to_precision(
+            0, 1, precision=3, resolution=2,
+            error_func_upper=elliptic_function.error_function
+        )
+        assert value == Decimal('4.844')
+        assert error < Decimal('0.00005')
+        assert len(evaluations) < 2000
+
+    def test_integral_progression(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+            Mode.DECREASING
+        )
+        progression = list(integrator.integral_progression(0, 1, 3, 2))
+        assert len(progression) > 1
+        evaluations = [p[2] for p in progression]
+        assert evaluations == sorted(evaluations)
+        estimate, error, _ = progression[-1]
+        assert error < Decimal('0.00005')
+        assert all(p[1] >= Decimal('0.00005') for p in progression[:-1])
+        assert (round(estimate, 3), error) \
+            == integrator.integral_to_precision(0, 1, 3, 2)
+
+    def test_integral_progression_stopped_early(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+            Mode.DECREASING
+        )
+        for estimate, error, evaluations in integrator.integral_progression(
+            0, 1, 10, 2
+        ):
+            if error < Decimal('0.01'):
+                break
+        assert abs(estimate - Decimal('3.14159')) < error
+        assert evaluations < 200
+        assert len(integrator.cache) == 0
+
+    def test_integral_to_precision_evaluation_budget(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+            Mode.DECREASING
+        )
+        result = integrator.integral_to_precision(
+            0, 1, 10, 2, max_evaluations=100
+        )
+        value, error = result
+        assert not result.converged
+        assert abs(value - Decimal('3.14159')) < error
+        assert integrator.integral_to_precision(0, 1, 1, 2).converged
+
+    def test_integral_to_precision_deadline(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+            Mode.DECREASING
+        )
+        result = integrator.integral_to_precision(
+            0, 1, 10, 2, deadline=time.monotonic()
+        )
+        assert not result.converged
+        assert abs(result[0] - Decimal('3.14159')) < result[1]
+
+    def test_integrate_evaluation_budget(self):
+        evaluations = []
+
+        def func(x):
+            evaluations.append(x)
+            return 3 * x ** 2
+
+        integrator = Integrator(DecimalNumber.of(0), func)
+        result = integrator.integrate(-1, 1, 10, 10, max_evaluations=30)
+        assert not result.converged
+        assert len(evaluations) < 50
+        assert result.min <= 2 <= result.max
+        assert integrator.integrate(-1, 1, 10, 10).converged
+
+    def test_integral_to_precision_parallel(self):
+        elliptic_function = EllipticFunction(2)
+        integrator = Integrator(
+            DecimalNumber.of(0), elliptic_function.evaluate, Mode.DECREASING
+        )
+        with ProcessPoolExecutor(2) as executor:
+            value, error = integrator.integral_to_precision_parallel(
+                0, 1, precision=3, resolution=2,
+                error_func_upper=elliptic_function.error_function,
+                executor=executor, workers=2,
+            )
+        assert value == Decimal('4.844')
+        assert error < Decimal('0.00005')
+
+    def test_integral_to_precision_parallel_threads(self):
+        evaluations = []
+
+        def func(x):
+            evaluations.append(x)
+            return 4 * (1 - x ** 2) ** Decimal('0.5')
+
+        integrator = Integrator(DecimalNumber.of(0), func, Mode.DECREASING)
+        with ThreadPoolExecutor(3) as executor:
+            result = integrator.integral_to_precision_parallel(
+                0, 1, 3, 2, executor=executor, workers=3,
+            )
+        value, error = result
+        assert value == Decimal('3.142')
+        assert error < Decimal('0.00005')
+        assert result.converged
+        # Evaluations made by the workers are counted too
+        assert integrator.stats.evaluations == len(evaluations)
+        assert integrator.stats.evaluations > integrator.stats.misses
+
+    def test_romberg_reuses_evaluations(self):
+        evaluations = []
+
+        def func(x):
+            evaluations.append(x)
+            return 4 / (1 + x ** 2)
+
+        result = Integrator(DecimalNumber.of(0), func)\
+            .integrate_romberg(0, 1, 15)
+        assert round(result.trap, 15) == Decimal('3.141592653589793')
+        assert result.min < result.trap < result.max
+        assert result.max - result.min < Decimal('1E-15')
+        assert len(evaluations) == len(set(evaluations))
+        # Every level evaluates the new midpoints only
+        assert len(evaluations) in [2 ** n + 1 for n in range(20)]
+
+    def test_romberg_polynomial_is_exact(self):
+        result = Integrator(DecimalNumber.of(0), Polynomial(1, 0, 3).evaluate)\
+            .integrate_romberg(0, 2, 10)
+        assert result.trap == 10
+        assert result.converged
+
+    def test_romberg_reports_running_out_of_levels(self):
+        result = Integrator(
+            DecimalNumber.of(0), lambda x: 4 * (1 - x ** 2) ** Decimal('0.5')
+        ).integrate_romberg(0, 1, 10, max_level=3)
+        assert not result.converged
+        assert result.min < result.trap < result.max
+
+    def test_gauss_kronrod_circle_area(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+        )
+        result = integrator.integral_gauss_kronrod(0, 1, 15)
+        value, error = result
+        assert value == Decimal('3.141592653589793')
+        assert error < Decimal('5E-16')
+        assert result.converged
+        assert not integrator.integral_gauss_kronrod(
+            0, 1, 15, max_intervals=2
+        ).converged
+
+    def test_gauss_kronrod_floats(self):
+        value, error = Integrator(0.0, lambda x: 1 / (1 + x ** 2))\
+            .integral_gauss_kronrod(0, 1, 12)
+        assert value == 0.785398163397
+        assert error < 5E-13
+
+    def test_gauss_kronrod_high_precision(self):
+        with localcontext() as context:
+            context.prec = 45
+            value, error = Integrator(
+                DecimalNumber.of(0), Polynomial(0, 0, 0, 0, 1).evaluate
+            ).integral_gauss_kronrod(1, 3, 40)
+        assert value == Decimal('48.4')
+        assert error < Decimal('5E-41')
+
+    def test_gauss_kronrod_beyond_default_precision(self):
+        value, error = Integrator(
+            DecimalNumber.of(0), lambda x: 4 / (1 + x ** 2)
+        ).integral_gauss_kronrod(0, 1, 35)
+        assert value == Decimal('3.14159265358979323846264338327950288')
+        assert error < Decimal('5E-36')
+
+    def test_integral_progression_does_not_leak_context(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** Decimal('0.5'),
+            Mode.DECREASING
+        )
+        with localcontext() as context:
+            context.prec = 50
+            for _ in integrator.integral_progression(0, 1, 3, 2):
+                assert context.prec == 50
+                assert len(str(Decimal(1) / 3)) == 52
+
+    def test_tanh_sinh_endpoint_singularity(self):
+        elliptic_function = EllipticFunction(2)
+        integrator = Integrator(
+            DecimalNumber.of(0), elliptic_function.evaluate
+        )
+        result = integrator.integral_tanh_sinh(0, 1, 20)
+        assert result.converged
+        assert result[0] == Decimal('4.84422411027383809921')
+        assert result[1] < Decimal('5E-21')
+
+        value, error = Integrator(
+            DecimalNumber.of(0), lambda x: 1 / x ** Decimal('0.5')
+        ).integral_tanh_sinh(0, 4, 12)
+        assert value == 4
+        assert error < Decimal('5E-13')
+
+    def test_tanh_sinh_floats_report_unreachable_sliver(self):
+        result = Integrator(
+            0.0, lambda x: 2 * ((4 - 3 * x * x) / (1 - x * x)) ** 0.5
+        ).integral_tanh_sinh(0, 1, 8)
+        assert not result.converged
+        assert abs(result[0] - 4.84422411) <= result[1]
+
+    def test_stats_integral_to_precision(self):
+        integrator = Integrator(
+            DecimalNumber.of(0), lambda x: 4 * (1 - x ** 2) ** Decimal('0.5')
+        )
+        integrator.integral_to_precision(0, 1, 3)
+        stats = integrator.stats
+        assert stats.evaluations == stats.misses > 0
+        assert stats.hits > 0
+        assert stats.rounds > 0
+        # Every round replaces one candidate with at least two
+        assert stats.partition_size >= stats.rounds + 1
+        assert stats.max_candidates >= stats.partition_size
+        assert stats.seconds['get_local_extrema'] > 0
+        assert stats.seconds['output_range'] > 0
+
+        integrator.integrate(0, 1, 5, 4)
+        assert integrator.stats.rounds == 0
+        assert integrator.stats.partition_size == 5
+        assert integrator.stats.evaluations == 21
+
+    def test_stats_with_persistent_cache(self):
+        integrator = Integrator(
+            DecimalNumber.of(0), Polynomial(0, 0, 3).evaluate,
+            persistent_cache=True,
+        )
+        integrator.integrate_romberg(0, 1, 10)
+        assert integrator.stats.evaluations == 5
+        assert integrator.stats.rounds == 2
+        assert integrator.stats.partition_size == 4
+        integrator.integrate_romberg(0, 1, 10)
+        assert integrator.stats.evaluations == 0
+        assert integrator.stats.hits == 5
+
+    def test_stats_profiler_tree(self):
+        integrator = Integrator(
+            DecimalNumber.of(0), Polynomial(0, 0, 3).evaluate
+        )
+        with TimingContext.get() as overall:
+            integrator.integral_to_precision(0, 1, 2)
+        names = [child.name for child in overall.get_results().children]
+        assert names == ['output_range', 'get_local_extrema']
+
+
+class TestDecimalArrayIntegrator(TestCase):
+    def test_integrate_matches_scalar(self):
+        circle = Circle(0, 0, 2)
+        for mode in (Mode.FLUCTUATING, Mode.DECREASING, Mode.SHARED_GRID):
+            results = []
+            for backend in (Backend.SCALAR, Backend.DECIMAL_ARRAY):
+                integrator = Integrator(
+                    DecimalNumber.of(0), circle.func.evaluate, mode, backend
+                )
+                result = integrator.integrate(0, 2, 8, 10)
+                results.append((
+                    result.min, result.max, result.trap,
+                    integrator.stats.evaluations,
+                ))
+            assert results[0] == results[1]
+
+    def test_integral_to_precision_matches_scalar(self):
+        elliptic_function = EllipticFunction(2)
+        results = []
+        for backend in (Backend.SCALAR, Backend.DECIMAL_ARRAY):
+            integrator = Integrator(
+                DecimalNumber.of(0), elliptic_function.func.evaluate,
+                backend=backend,
+            )
+            results.append((integrator.integral_to_precision(
+                0, 1, precision=3, resolution=2,
+                error_func_upper=elliptic_function.error_function
+            ), integrator.stats.evaluations))
+        assert results[0] == results[1]
+        assert results[1][0][0] == Decimal('4.844')
+
+    def test_integrate_evaluation_budget(self):
+        integrator = Integrator(
+            DecimalNumber.of(0), lambda x: 3 * x ** 2,
+            backend=Backend.DECIMAL_ARRAY,
+        )
+        result = integrator.integrate(-1, 1, 10, 10, max_evaluations=30)
+        assert not result.converged
+        assert integrator.stats.partition_size == 3
+        assert result.min <= 2 <= result.max
+
+    def test_requires_decimal_numbers(self):
+        with self.assertRaises(Exception):
+            Integrator(0.0, lambda x: x, backend=Backend.DECIMAL_ARRAY)
+
+
+@skipIf(not numpy_available(), 'numpy is not installed')
+class TestNumpyIntegrator(TestCase):
+    def test_integrate_linear(self):
+        result = Integrator(
+            DecimalNumber.of(0), Polynomial(0, 2).evaluate,
+            backend=Backend.NUMPY,
+        ).integrate(0, 2, 4)
+        assert result.trap == 4
+        assert result.min == 3
+        assert result.max == 5
+
+    def test_integrate_custom_function(self):
+        class Square(DifferentiableFunction):
+            def evaluate(self, x):
+                return x * x
+
+            def differentiate(self):
+                return Polynomial(0, 2)
+
+            def __mul__(self, other):
+                raise NotImplementedError
+
+            def __rmul__(self, other):
+                raise NotImplementedError
+
+            def __add__(self, other):
+                raise NotImplementedError
+
+            def __matmul__(self, other):
+                raise NotImplementedError
+
+        result = Integrator(
+            DecimalNumber.of(0), Square().evaluate, backend=Backend.NUMPY
+        ).integrate(-1, 1, 4)
+        assert abs(result.trap - Decimal('0.75')) < Decimal('1E-12')
+
+    def test_integrate_parabola_matches_scalar(self):
+        scalar = Integrator(DecimalNumber.of(0), lambda x: 3 * x ** 2)\
+            .integrate(-1, 1, 5)
+        vectorized = Integrator(
+            DecimalNumber.of(0), lambda x: 3 * x ** 2, backend=Backend.NUMPY
+        ).integrate(-1, 1, 5)
+        for expected, actual in [
+            (scalar.trap, vectorized.trap),
+            (scalar.min, vectorized.min),
+            (scalar.max, vectorized.max),
+        ]:
+            assert abs(expected - actual) < Decimal('1E-12')
+
+    def test_integrate_parabola_shared_grid(self):
+        result = Integrator(
+            DecimalNumber.of(0), lambda x: 3 * x ** 2,
+            Mode.SHARED_GRID, Backend.NUMPY,
+        ).integrate(-1, 1, 4)
+        assert abs(result.trap - Decimal('2.25')) < Decimal('1E-12')
+        assert abs(result.min - Decimal('0.75')) < Decimal('1E-12')
+        assert abs(result.max - Decimal('3.75')) < Decimal('1E-12')
+
+    def test_integrate_evaluation_budget(self):
+        result = Integrator(
+            DecimalNumber.of(0), lambda x: 3 * x ** 2, backend=Backend.NUMPY
+        ).integrate(-1, 1, 10, 10, max_evaluations=30)
+        assert not result.converged
+        assert result.min <= 2 <= result.max
+
+    def test_integrate_function_tree_decreasing(self):
+        circle = Circle(0, 0, 2)
+        result = Integrator(
+            DecimalNumber.of(0), circle.func, Mode.DECREASING, Backend.NUMPY
+        ).integrate(0, 2, 100)
+        assert round(result.trap, 2) == Decimal('3.14')
+        assert result.max - result.min < Decimal('0.05')
+
+    def test_calculate_circle_area_to_precision(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** 0.5,
+            Mode.DECREASING,
+            Backend.NUMPY,
+        )
+        value, error = integrator.integral_to_precision(0, 1, 8, 2)
+        assert value == Decimal('3.14159265')
+        assert error < Decimal('5E-9')
+
+    def test_integral_progression(self):
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            lambda x: 4 * (1 - x ** 2) ** 0.5,
+            Mode.DECREASING,
+            Backend.NUMPY,
+        )
+        progression = list(integrator.integral_progression(0, 1, 4, 2))
+        assert progression[0][2] == 3
+        assert integrator.stats.evaluations == progression[-1][2]
+        assert integrator.stats.rounds == len(progression) - 1
+        assert progression[-1][1] < Decimal('0.000005')
+        assert round(progression[-1][0], 4) == Decimal('3.1416')
+
+    def test_calculate_elliptic_integrals(self):
+        elliptic_function = EllipticFunction(2)
+        integrator = Integrator(
+            DecimalNumber.of(0),
+            elliptic_function.func,
+            Mode.DECREASING,
+            Backend.NUMPY,
+        )
+        assert integrator.integral_to_precision(
+            0, 1, precision=3, resolution=2,
+            error_func_upper=elliptic_function.error_function
+        )[0] == Decimal('4.844')
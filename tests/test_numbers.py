@@ -1,7 +1,14 @@
-from decimal import Decimal
-
+from decimal import Context, Decimal, localcontext
+from fractions import Fraction
+
+from calculus.integrator import Integrator
+from custom_numbers.computation import DecimalArray, DecimalNumber, \
+    working_digits
+from custom_numbers.dual import DualNumber
+from custom_numbers.jet import Jet
 from custom_numbers.exact.factory import to_exact
 from custom_numbers.exact.rational_number import RationalNumber
+from custom_numbers.radicals.factoring import PrimeSieve, factor, is_prime
 from custom_numbers.radicals.radical_sum import RadicalSum
 from custom_numbers.radicals.radical_term import RadicalTerm
 from custom_numbers.utils import newton_int_sqrt
@@ -56,6 +63,34 @@ def test_rational_number_sub_int():
     assert RationalNumber(3, 4) - 2 == RationalNumber(-5, 4)
 
 
+def test_rational_number_is_reduced_lazily():
+    x = RationalNumber(6, -4)
+    assert x == RationalNumber(-3, 2)
+    assert (x.numerator, x.denominator) == (-3, 2)
+    assert repr(RationalNumber(10, 5)) \
+        == 'RationalNumber(numerator=2, denominator=1)'
+
+
+def test_rational_number_hashes_like_fraction():
+    for numerator, denominator in [(1, 3), (-7, 4), (6, 4), (0, 9),
+                                   (2 ** 80 + 1, 3 ** 60)]:
+        assert hash(RationalNumber(numerator, denominator)) \
+            == hash(Fraction(numerator, denominator))
+    assert hash(RationalNumber(4, 2)) == hash(2)
+    assert hash(RationalNumber(1, 4)) == hash(Decimal('0.25'))
+
+
+def test_rational_number_big_denominators_stay_exact():
+    total = RationalNumber()
+    for n in range(1, 100):
+        total = total + RationalNumber(1, n * n)
+    expected = sum(Fraction(1, n * n) for n in range(1, 100))
+    assert (total.numerator, total.denominator) \
+        == (expected.numerator, expected.denominator)
+    assert RationalNumber(1, 10 ** 15) + RationalNumber(1, 3) \
+        == RationalNumber(10 ** 15 + 3, 3 * 10 ** 15)
+
+
 def test_rational_number_is_numeric():
     assert isinstance(RationalNumber(7), Numeric)
 
@@ -107,6 +142,139 @@ def test_abs():
     assert abs(RationalNumber(-4, 13)) == RationalNumber(4, 13)
 
 
+def test_working_digits():
+    assert working_digits(3) == 13
+    assert working_digits(3, Decimal('4.8')) == 14
+    assert working_digits(3, DecimalNumber.of(-12345)) == 18
+    assert working_digits(-20, 10 ** 6) == 10
+
+
+def test_decimal_number_round_in_narrow_context():
+    with localcontext() as context:
+        context.prec = 3
+        assert round(DecimalNumber.parse('12345.6789'), 2) \
+            == Decimal('12345.68')
+
+
+def test_decimal_number_is_slotted_and_interned():
+    assert not hasattr(DecimalNumber.of(2), '__dict__')
+    assert DecimalNumber.of(0) is DecimalNumber.ZERO
+    assert DecimalNumber.of(1) is DecimalNumber.ONE
+    assert DecimalNumber.parse('-inf') is DecimalNumber.NEG_INF
+    assert DecimalNumber.of(DecimalNumber.ONE) == 1
+
+
+def test_decimal_number_builtin_operands():
+    x = DecimalNumber.of(Decimal('2.5'))
+    assert x - 1 == Decimal('1.5') and 1 - x == Decimal('-1.5')
+    assert x - Decimal('0.5') == 2 and x - 0.5 == 2
+    assert 5 / x == 2 and x / 5 == Decimal('0.5')
+    assert x ** 2 == Decimal('6.25')
+    # Float exponents are read as they print, like the other operands
+    assert DecimalNumber.of(2) ** 0.1 \
+        == DecimalNumber.of(2) ** Decimal('0.1')
+    assert x > 2 and x >= x and not x > DecimalNumber.INF
+    assert DecimalNumber.INF - x == DecimalNumber.INF
+    assert 1 - DecimalNumber.INF == DecimalNumber.NEG_INF
+
+
+def test_decimal_number_float_subclass_operands():
+    # numpy.float64 is a subclass of float
+    class Float64(float):
+        pass
+
+    x = DecimalNumber.of(1)
+    assert x + Float64(0.5) == Decimal('1.5')
+    assert Float64(0.5) * x == Decimal('0.5')
+    assert x ** Float64(0.5) == x ** Decimal('0.5')
+    integrator = Integrator(DecimalNumber.of(0), lambda t: 2 * t)
+    assert integrator.integrate(Float64(0), Float64(1), 4).trap == 1
+
+
+def test_decimal_number_divides_other_number_types():
+    # Division by a number type DecimalNumber does not know is left to it
+    result = DecimalNumber.of(6) / DualNumber(DecimalNumber.of(2), 1)
+    assert result.value == 3
+    assert result.derivative == Decimal('-1.5')
+
+
+def test_decimal_number_sum_many():
+    values = [DecimalNumber.of(Decimal('0.1'))] * 10 + [2, Decimal('0.5')]
+    assert DecimalNumber.sum_many(values) == Decimal('3.5')
+    assert DecimalNumber.sum_many([]) == 0
+    assert DecimalNumber.sum_many(
+        [DecimalNumber.of(1), DecimalNumber.INF, DecimalNumber.NEG_INF]
+    ) == DecimalNumber.INF
+    # Other number types take over the rest of the sum
+    result = DecimalNumber.sum_many(
+        [DecimalNumber.of(1), DualNumber(DecimalNumber.of(2), 1), 3]
+    )
+    assert result.value == 6 and result.derivative == 1
+
+
+def test_decimal_array_matches_decimal_number():
+    xs = DecimalArray.grid(DecimalNumber.of(0), DecimalNumber.of(1), 6)
+    assert len(xs) == 7
+    func = lambda x: 4 * (1 - x ** 2) ** Decimal('0.5') / 3 + x * x - 1
+    ys = func(xs)
+    for n, x in enumerate(xs):
+        assert x == DecimalNumber.of(0) + DecimalNumber.of(1) * n / 6
+        assert ys[n] == func(x)
+    assert ys.min() == min(ys) and ys.max() == max(ys)
+    assert xs.sum() == Decimal('3.5')
+    assert (xs < Decimal('0.5')) == [True] * 3 + [False] * 4
+    assert list(-xs[1:3] + xs[1:3]) == [0, 0]
+
+
+def test_decimal_array_context():
+    xs = DecimalArray([1, 2, 3], Context(prec=5))
+    assert (xs / 3).values == [
+        Decimal('0.33333'), Decimal('0.66667'), Decimal(1)
+    ]
+    assert (1 / DecimalArray([DecimalNumber.INF, -2]))[1] == Decimal('-0.5')
+    try:
+        xs + DecimalArray([1])
+        assert False
+    except Exception as e:
+        assert 'cannot be combined' in str(e)
+
+
+def test_dual_number_arithmetic():
+    x = DualNumber(RationalNumber(3), 1)
+    # f(x) = (2x^2 - 1) / x, f'(x) = 2 + 1 / x^2
+    result = (2 * x ** 2 - 1) / x
+    assert result.value == RationalNumber(17, 3)
+    assert result.derivative == RationalNumber(19, 9)
+    # g(x) = 1 / (1 - x) ^ 0.5 at 0.5
+    result = 1 / (1 - DualNumber(DecimalNumber.of(Decimal('0.75')), 1)) \
+        ** Decimal('0.5')
+    assert result.value == 2
+    assert abs(result.derivative - 4) < Decimal('1E-25')
+    assert DualNumber(2, 5) == 2 and DualNumber(2, 5) < DualNumber(3)
+    assert abs(DualNumber(-2, 5)).derivative == -5
+
+
+def test_jet_arithmetic():
+    x = Jet.variable(RationalNumber(2), 3)
+    # (x^2 + 1) / x = x + 1/x
+    result = (x ** 2 + 1) / x
+    assert result.derivatives() == [
+        RationalNumber(5, 2), RationalNumber(3, 4), RationalNumber(1, 4),
+        RationalNumber(-3, 8),
+    ]
+    # Constants are jets of order 0
+    assert (Jet(3) * x).order == 3
+    assert (x - x).derivatives() == [0, 0, 0, 0]
+    assert (x ** -1).derivative(3) == RationalNumber(-3, 8)
+
+
+def test_jet_fractional_power():
+    result = Jet.variable(DecimalNumber.of(4), 2) ** Decimal('0.5')
+    assert result.value == 2
+    assert result.derivative(1) == Decimal('0.25')
+    assert result.derivative(2) == Decimal('-0.03125')
+
+
 def test_int_sqrt_perfect_squares():
     assert newton_int_sqrt(0) == 0
     assert newton_int_sqrt(1) == 1
@@ -183,6 +351,37 @@ def test_radical_term_prod():
     assert a * b == RadicalTerm.reduced(28, 30, RationalNumber(3 ** 5 * 4 ** 3))
 
 
+def test_radical_term_prod_large_contents():
+    a = RadicalTerm.reduced(3, 2, RationalNumber(6000000042, 9999999967))
+    b = RadicalTerm.reduced(2, 3, RationalNumber(12345678901, 98765432101))
+    assert a * b == RadicalTerm.reduced(6, 6, RationalNumber(
+        6000000042 ** 3 * 12345678901 ** 2,
+        9999999967 ** 3 * 98765432101 ** 2,
+    ))
+
+
+def test_factor():
+    assert dict(factor(2 ** 4 * 3 * 1000000007 * 998244353)) == {
+        2: 4, 3: 1, 998244353: 1, 1000000007: 1
+    }
+    assert dict(factor((2 ** 61 - 1) ** 2 * 99991)) == {
+        99991: 1, 2 ** 61 - 1: 2
+    }
+    assert dict(factor(1)) == {}
+    # Remembered factorizations are not shared
+    factor(12).factors[5] = 1
+    assert dict(factor(12)) == {2: 2, 3: 1}
+
+
+def test_primes():
+    sieve = PrimeSieve()
+    assert sieve.primes_up_to(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    primes = sieve.primes_up_to(10000)
+    assert len(primes) == 1229
+    assert [n for n in range(10000) if is_prime(n)] == primes
+    assert is_prime(2 ** 61 - 1) and not is_prime(3215031751)
+
+
 def test_radical_term_eq_rational():
     assert RadicalTerm(RationalNumber(3, 7), 2, RationalNumber(4)) != \
            RationalNumber(6, 7)
@@ -1,5 +1,8 @@
 from unittest import TestCase
 
+from custom_numbers.computation import DecimalNumber
+from custom_numbers.exact.rational_number import RationalNumber
+
 from elementary_functions.polynomial import Polynomial
 from elementary_functions.power import PowerFunction
 from elementary_functions.calculus_utils import ConstantFunction
@@ -43,5 +46,23 @@ class TestPolynomial(TestCase):
         second = Polynomial(1, 5, 7)
         assert first * second == Polynomial(2, 11, 23, 27, 28)
 
+    def test_polynomial_evaluate(self):
+        func = Polynomial(-4, 0, 3, 0, 0)
+        for x in [RationalNumber(-3, 2), RationalNumber(0), RationalNumber(5)]:
+            assert func.evaluate(x) == -4 + 3 * x * x
+        assert func.evaluate(DecimalNumber.of(2)) == DecimalNumber.of(8)
+        assert Polynomial(7).evaluate(DecimalNumber.of(2)) == 7
+        assert Polynomial().evaluate(DecimalNumber.of(2)) == 0
 
+    def test_polynomial_evaluate_many(self):
+        func = Polynomial(1, 2, 3)
+        xs = [RationalNumber(n, 3) for n in range(-6, 7)]
+        assert func.evaluate_many(xs) == list(map(func.evaluate, xs))
+        assert Polynomial(5).evaluate_many(xs[:2]) == [5, 5]
 
+    def test_polynomial_constituents_follow_reduction(self):
+        first = Polynomial(2, 1, 0)
+        assert first.constituents == [PowerFunction(0, 2), PowerFunction(1)]
+        assert first * Polynomial(0, 1) == Polynomial(0, 2, 1)
+        assert first.coefficients == [2, 1]
+        assert first.constituents == [PowerFunction(0, 2), PowerFunction(1)]
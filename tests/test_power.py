@@ -1,6 +1,10 @@
 from elementary_functions.polynomial import Polynomial
 from elementary_functions.power import PowerFunction
 from elementary_functions.calculus_utils import ConstantFunction
+from elementary_functions.simple import CharacteristicFunction, \
+    SimpleFunction
+from elementary_functions.utils import FunctionProd, FunctionSum
+from general.interval import Interval
 
 
 def test_sum():
@@ -26,3 +30,36 @@ def test_equals_linear_polynomial():
 def test_equals_higher_order_polynomial():
     assert PowerFunction(7, 3) == Polynomial(0, 0, 0, 0, 0, 0, 0, 3)
     assert Polynomial(0, 0, 0, 0, 0, 0, 0, 3) == PowerFunction(7, 3)
+
+
+def test_equal_functions_hash_alike():
+    square_root = PowerFunction(0.5) @ Polynomial(1, 0, -1)
+    pairs = [
+        (ConstantFunction(3), PowerFunction(0, 3)),
+        (ConstantFunction(3), Polynomial(3)),
+        (PowerFunction(3, 2) + PowerFunction(4, -3),
+         Polynomial(0, 0, 0, 2, -3)),
+        (FunctionSum(PowerFunction(1), square_root),
+         FunctionSum(PowerFunction(0.5) @ Polynomial(1, 0, -1),
+                     PowerFunction(1))),
+        (FunctionProd(square_root, PowerFunction(2)),
+         FunctionProd(PowerFunction(2), square_root)),
+        (FunctionSum(square_root), square_root),
+        (FunctionSum(), ConstantFunction(0)),
+        (FunctionProd(), ConstantFunction(1)),
+        (SimpleFunction(CharacteristicFunction(Interval(0, 1), 2)),
+         CharacteristicFunction(Interval(0, 1), 2)),
+    ]
+    for first, second in pairs:
+        assert first == second
+        assert hash(first) == hash(second)
+
+
+def test_structural_inequality():
+    x = PowerFunction(1)
+    assert FunctionSum(x, x) != FunctionSum(x)
+    assert FunctionSum(x, PowerFunction(2)) \
+        != FunctionProd(x, PowerFunction(2))
+    assert CharacteristicFunction(Interval(0, 1), 2) \
+        != CharacteristicFunction(Interval(0, 1), 3)
+    assert PowerFunction(0.5) @ x != PowerFunction(0.5) @ PowerFunction(2)
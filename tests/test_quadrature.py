@@ -0,0 +1,54 @@
+from decimal import Decimal, localcontext
+
+from calculus.quadrature import decimal_pi, gauss_kronrod, legendre, \
+    stieltjes, tanh_sinh
+
+
+def test_legendre():
+    assert legendre(3) == [0, -1.5, 0, 2.5]
+
+
+def test_stieltjes_roots_interlace_with_gauss_nodes():
+    nodes, kronrod_weights, gauss_weights = gauss_kronrod(7, 30)
+    assert len(nodes) == 15
+    assert [w != 0 for w in gauss_weights] == [n % 2 == 1 for n in range(15)]
+    assert len(stieltjes(7)) == 9
+
+
+def test_gauss_kronrod_15_point_rule():
+    nodes, kronrod_weights, gauss_weights = gauss_kronrod(7, 30)
+    assert nodes[-1] == Decimal('0.991455371120812639206854697526')
+    assert kronrod_weights[-1] == Decimal('0.0229353220105292249637320080590')
+    assert gauss_weights[-2] == Decimal('0.129484966168869693270611432679')
+
+
+def test_gauss_kronrod_integrates_polynomials_exactly():
+    nodes, kronrod_weights, gauss_weights = gauss_kronrod(7, 40)
+    with localcontext() as context:
+        context.prec = 40
+        # The Kronrod rule is exact up to degree 3n + 1 and the Gauss rule
+        # up to degree 2n - 1.
+        kronrod = sum(w * x ** 22 for x, w in zip(nodes, kronrod_weights))
+        gauss = sum(w * x ** 12 for x, w in zip(nodes, gauss_weights))
+        assert abs(kronrod - Decimal(2) / 23) < Decimal('1E-38')
+        assert abs(gauss - Decimal(2) / 13) < Decimal('1E-38')
+
+
+def test_decimal_pi():
+    assert decimal_pi(30) == Decimal('3.14159265358979323846264338328')
+
+
+def test_tanh_sinh_levels_are_nested():
+    assert len(tanh_sinh(0, 30)) == 4
+    assert all(c < 1 for c, _ in tanh_sinh(1, 30))
+    with localcontext() as context:
+        context.prec = 30
+        complement, weight = tanh_sinh(0, 30)[0]
+        assert complement == 1
+        assert weight == decimal_pi(30) / 2
+        # Integrating 1 over [-1, 1] with the rule of level 4
+        total = sum(
+            w if c == 1 else 2 * w
+            for level in range(5) for c, w in tanh_sinh(level, 30)
+        )
+        assert abs(total / 16 - 2) < Decimal('1E-25')